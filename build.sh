@@ -84,9 +84,10 @@ echo "✅ Conda environment activated"
 echo ""
 
 # 6. Inject Git hash into version file
-echo "Step 6/8: Injecting Git commit hash..."
+echo "Step 6/8: Injecting Git commit hash and instrument data..."
 echo "GIT_COMMIT = '$GIT_HASH'" > src/utils/git_version.py
 echo "✅ Git hash injected"
+python embed_instruments.py
 echo ""
 
 # 7. Run PyInstaller
@@ -0,0 +1,19 @@
+"""Embed the instruments database as a Python module for frozen builds.
+
+Reads src/data/instruments.json and writes src/notation/instruments_data.py
+containing an INSTRUMENTS literal. The bundled app imports the module (a
+precompiled .pyc) instead of parsing JSON on every launch. Run by build.sh;
+the generated module is not checked in.
+"""
+import json
+import pprint
+
+with open('src/data/instruments.json', 'r') as f:
+    data = json.load(f)
+
+with open('src/notation/instruments_data.py', 'w') as f:
+    f.write('"""Instrument data embedded from data/instruments.json.\n\n')
+    f.write('Generated by embed_instruments.py - do not edit.\n"""\n\n')
+    f.write(f"INSTRUMENTS = {pprint.pformat(data['instruments'], width=100, sort_dicts=False)}\n")
+
+print(f"✅ Embedded {len(data['instruments'])} instruments")
@@ -10,6 +10,12 @@ This includes:
 - European folk/early instruments
 """
 import json
+import re
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 # MIDI program numbers (General MIDI + extended)
 MIDI_PROGRAMS = {
@@ -58,68 +64,74 @@ MIDI_PROGRAMS = {
 def get_midi_program(name):
     """Get MIDI program number for instrument."""
     name_lower = name.lower()
-    # Try exact matches first
-    for key, prog in MIDI_PROGRAMS.items():
-        if key == name_lower:
-            return prog
+    # Try exact match first
+    if name_lower in MIDI_PROGRAMS:
+        return MIDI_PROGRAMS[name_lower]
     # Try partial matches
     for key, prog in MIDI_PROGRAMS.items():
         if key in name_lower:
             return prog
     return 0  # Default to piano
 
+# Octave displacement markers and the semitones they add
+OCTAVE_SHIFTS = {'8va': 12, '8vb': -12, '15ma': 24, '15vb': -24, '16vb': -24, '22vb': -36}
+
+# Single pass over a key string: octave markers anywhere, flat keys anywhere,
+# and the leading key letter
+TRANSPOSITION_RE = re.compile(
+    r'(?P<octave>8va|8vb|15ma|15vb|16vb|22vb)'
+    r'|(?P<flat>[BE](?:b|♭))'
+    r'|^\s*(?P<lead>Ab|[ADFG])'
+)
+
+# Semitones for keys identified by their leading letter
+LEADING_KEY_SHIFTS = {'A': -3, 'F': -5, 'G': -2, 'D': 2, 'Ab': -4}
+
 def parse_transposition(key_str, name):
     """Parse transposition from key string and handle octave displacements."""
-    semitones = 0
+    octave = flat = lead = None
+    for match in TRANSPOSITION_RE.finditer(key_str):
+        if match.lastgroup == 'octave':
+            octave = octave or match.group('octave')
+        elif match.lastgroup == 'flat':
+            # Bb takes precedence over Eb
+            if flat != 'B':
+                flat = match.group('flat')[0]
+        elif match.lastgroup == 'lead':
+            lead = match.group('lead')
     
     # Handle octave displacements
-    if '8va' in key_str and '8vb' not in key_str:
-        semitones = 12  # Sounds octave higher
-    elif '8vb' in key_str:
-        semitones = -12  # Sounds octave lower
-    elif '15ma' in key_str:
-        semitones = 24  # Sounds 2 octaves higher
-    elif '15vb' in key_str or '16vb' in key_str:
-        semitones = -24  # Sounds 2 octaves lower
-    elif '22vb' in key_str:
-        semitones = -36  # Sounds 3 octaves lower
+    semitones = OCTAVE_SHIFTS.get(octave, 0)
     
     # Add transposition from key
-    if 'Bb' in key_str or 'B♭' in key_str:
+    if flat == 'B':
         semitones += -2
-    elif 'Eb' in key_str or 'E♭' in key_str:
-        if 'alto' in name.lower() or 'soprano' in name.lower():
+    elif flat == 'E':
+        name_lower = name.lower()
+        if 'alto' in name_lower or 'soprano' in name_lower:
             semitones += 3
         else:
             semitones += -3
-    elif key_str.strip().startswith('A') and not key_str.startswith('Ab'):
-        semitones += -3
-    elif key_str.strip().startswith('F'):
-        semitones += -5
-    elif key_str.strip().startswith('G'):
-        semitones += -2
-    elif key_str.strip().startswith('D'):
+    elif lead == 'D':
         if 'contrabass' not in name.lower():
             semitones += 2
-    elif key_str.strip().startswith('Ab'):
-        semitones += -4
+    elif lead:
+        semitones += LEADING_KEY_SHIFTS[lead]
     
     return semitones
 
+# Clef tokens in output order
+CLEF_TOKENS = (('tr', 'treble'), ('bs', 'bass'), ('al', 'alto'), ('tn', 'tenor'))
+CLEF_RE = re.compile(r'tr|bs|al|tn|gr|perc')
+
 def parse_clefs(clef_str):
     """Parse clef list from string."""
-    clefs = []
-    if 'tr' in clef_str:
-        clefs.append('treble')
-    if 'bs' in clef_str:
-        clefs.append('bass')
-    if 'al' in clef_str:
-        clefs.append('alto')
-    if 'tn' in clef_str:
-        clefs.append('tenor')
-    if 'gr' in clef_str:
+    tokens = set(CLEF_RE.findall(clef_str))
+    if 'gr' in tokens:
         clefs = ['treble', 'bass']  # Grand staff
-    if 'perc' in clef_str:
+    else:
+        clefs = [clef for token, clef in CLEF_TOKENS if token in tokens]
+    if 'perc' in tokens:
         clefs.append('percussion')
     
     return clefs if clefs else ['treble']
@@ -291,9 +303,13 @@ for line in comprehensive_list.strip().split('\n'):
 # Create final JSON structure
 instruments_json = {"instruments": instruments_data}
 
-# Write to file
-with open('src/data/instruments.json', 'w') as f:
-    json.dump(instruments_json, f, indent=2)
+# Write to file (orjson serializes the whole document in one buffer)
+if ORJSON_AVAILABLE:
+    with open('src/data/instruments.json', 'wb') as f:
+        f.write(orjson.dumps(instruments_json, option=orjson.OPT_INDENT_2))
+else:
+    with open('src/data/instruments.json', 'w') as f:
+        json.dump(instruments_json, f, indent=2)
 
 print(f"✅ Generated {len(instruments_data)} instruments")
 print(f"   Families: {len(set(i['family'] for i in instruments_data))}")
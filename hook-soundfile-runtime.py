@@ -8,16 +8,26 @@ import sys
 # When frozen by PyInstaller
 if getattr(sys, 'frozen', False):
     # Monkey-patch soundfile BEFORE it loads
+    import ctypes
     import ctypes.util
     original_find_library = ctypes.util.find_library
     
+    # Resolve the bundled library once instead of on every lookup
+    bundled_lib = os.path.join(sys._MEIPASS, 'libsndfile.dylib')
+    if not os.path.exists(bundled_lib):
+        bundled_lib = None
+    else:
+        # Preload with global symbols so soundfile's own dlopen of the same
+        # path just reuses the already-loaded image
+        try:
+            ctypes.CDLL(bundled_lib, mode=ctypes.RTLD_GLOBAL | getattr(os, 'RTLD_NOW', 0))
+        except OSError:
+            bundled_lib = None
+    
     def patched_find_library(name):
-        if name == 'sndfile':
+        if name == 'sndfile' and bundled_lib:
             # Return path to our bundled library
-            bundle_dir = sys._MEIPASS
-            bundled_lib = os.path.join(bundle_dir, 'libsndfile.dylib')
-            if os.path.exists(bundled_lib):
-                return bundled_lib
+            return bundled_lib
         return original_find_library(name)
     
     ctypes.util.find_library = patched_find_library
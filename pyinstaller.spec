@@ -28,9 +28,10 @@ a = Analysis(
         'PySide6.QtWidgets',
         'scipy',
         'scipy.signal',
-        'scipy.interpolate',
+        'scipy.ndimage',
         'numpy',
         'resampy',
+        'notation.instruments_data',
         'jaraco',
         'jaraco.text',
         'jaraco.functools',
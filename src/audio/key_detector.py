@@ -1,12 +1,81 @@
 """Key detection using music21."""
 
+import functools
 import music21
 import numpy as np
-from typing import Tuple, Optional
+from typing import List, Tuple, Optional
 
 from utils.config import KEY_CONFIDENCE_THRESHOLD
 
 
+# Aarden-Essen key profiles, the weights music21 uses for analyze('key')
+_MAJOR_PROFILE = (
+    17.7661, 0.145624, 14.9265, 0.160186, 19.8049, 11.3587,
+    0.291248, 22.062, 0.145624, 8.15494, 0.232998, 4.95122
+)
+_MINOR_PROFILE = (
+    18.2648, 0.737619, 14.0499, 16.8599, 0.702494, 14.4362,
+    0.702494, 18.6161, 4.56621, 1.93186, 7.37619, 1.75623
+)
+
+# Tonic spellings music21 picks for each pitch class
+_MAJOR_TONICS = ('C', 'C#', 'D', 'E-', 'E', 'F', 'F#', 'G', 'A-', 'A', 'B-', 'B')
+_MINOR_TONICS = ('C', 'C#', 'D', 'E-', 'E', 'F', 'F#', 'G', 'G#', 'A', 'B-', 'B')
+
+
+def _correlate_keys(pc_histogram: Tuple[int, ...], profile: Tuple[float, ...]) -> List[float]:
+    """
+    Pearson correlation of a pitch-class histogram with the profile rotated to each tonic.
+    
+    The terms are summed one at a time in the same order as music21's
+    key analysis, so the coefficients are bit-for-bit identical to
+    analyze('key') and exact ties between keys resolve the same way.
+    Vectorised sums round differently and can flip those ties.
+    """
+    profile_mean = sum(profile) / len(profile)
+    histogram_mean = sum(pc_histogram) / len(pc_histogram)
+    
+    correlations = []
+    for tonic in range(12):
+        top = profile_ss = histogram_ss = 0.0
+        for pc in range(12):
+            weight = profile[(pc - tonic) % 12] - profile_mean
+            deviation = pc_histogram[pc] - histogram_mean
+            top += weight * deviation
+            profile_ss += weight ** 2
+            histogram_ss += deviation ** 2
+        if profile_ss == 0 or histogram_ss == 0:
+            correlations.append(0.0)
+        else:
+            correlations.append(top / (profile_ss * histogram_ss) ** 0.5)
+    return correlations
+
+
+@functools.lru_cache(maxsize=128)
+def _detect_from_pc_histogram(pc_histogram: Tuple[int, ...]) -> Tuple[str, float]:
+    """
+    Best-correlated key for a 12-bin pitch-class histogram (cached).
+    
+    Ties are broken as music21 does: among keys with the same
+    correlation the higher tonic pitch class wins (C=0 ... B=11), and
+    between a major and a minor key on the same tonic the minor key
+    wins. A histogram with no variation (e.g. every pitch class once)
+    correlates 0 with every key and so comes out as B minor.
+    """
+    # Correlate against all 24 major/minor keys
+    major = _correlate_keys(pc_histogram, _MAJOR_PROFILE)
+    minor = _correlate_keys(pc_histogram, _MINOR_PROFILE)
+    
+    # Highest (correlation, tonic pitch class) wins, minor on a full tie
+    best_major = max((r, pc) for pc, r in enumerate(major))
+    best_minor = max((r, pc) for pc, r in enumerate(minor))
+    if best_minor >= best_major:
+        confidence, tonic_pc = best_minor
+        return (f"{_MINOR_TONICS[tonic_pc]} minor", confidence)
+    confidence, tonic_pc = best_major
+    return (f"{_MAJOR_TONICS[tonic_pc]} major", confidence)
+
+
 class KeyDetector:
     """Detects musical key using Krumhansl-Schmuckler algorithm."""
     
@@ -24,30 +93,12 @@ class KeyDetector:
         if len(midi_notes) == 0:
             return ("C major", 0.0)
         
-        # Round to nearest semitone and convert to integers
+        # Round to nearest semitone and build a pitch-class histogram
+        # (every note counts equally, as each had the same duration before)
         midi_notes = np.round(midi_notes).astype(int)
+        pc_histogram = np.bincount(midi_notes % 12, minlength=12)
         
-        # Create a music21 stream with the notes
-        stream = music21.stream.Stream()
-        for midi_note in midi_notes:
-            n = music21.note.Note(midi=midi_note)
-            n.quarterLength = 1.0  # Arbitrary duration
-            stream.append(n)
-        
-        # Analyze key
-        try:
-            key = stream.analyze('key')
-            
-            # Get key name
-            key_name = f"{key.tonic.name} {key.mode}"
-            
-            # music21's key.correlationCoefficient gives confidence
-            confidence = key.correlationCoefficient
-            
-            return (key_name, float(confidence))
-        except Exception as e:
-            print(f"Key detection error: {e}")
-            return ("C major", 0.0)
+        return _detect_from_pc_histogram(tuple(pc_histogram.tolist()))
     
     @staticmethod
     def parse_key_name(key_name: str) -> Tuple[str, str]:
@@ -1,8 +1,7 @@
 """Built-in MIDI player using pygame."""
-import tempfile
-import os
-from pathlib import Path
+import io
 from music21 import stream
+from music21.midi import translate
 try:
     import pygame
     PYGAME_AVAILABLE = True
@@ -18,6 +17,9 @@ class MIDIPlayer:
         self.initialized = False
         self.playing = False
         
+        # Score currently loaded into the pygame music player
+        self._loaded_score = None
+        
         if PYGAME_AVAILABLE:
             try:
                 pygame.mixer.init(frequency=44100, size=-16, channels=2, buffer=512)
@@ -42,15 +44,16 @@ class MIDIPlayer:
             return False
         
         try:
-            # Create temporary MIDI file
-            temp_dir = tempfile.gettempdir()
-            midi_path = os.path.join(temp_dir, 'melody_transcriber_playback.mid')
-            
-            # Write score to MIDI file
-            score.write('midi', fp=midi_path)
+            # Replaying the loaded score only needs a restart
+            if score is not self._loaded_score:
+                self._loaded_score = None
+                
+                # Serialize to MIDI in memory (no temporary file)
+                midi_data = translate.music21ObjectToMidiFile(score).writestr()
+                pygame.mixer.music.load(io.BytesIO(midi_data), 'mid')
+                self._loaded_score = score
             
-            # Play the MIDI file
-            pygame.mixer.music.load(midi_path)
+            # Play the MIDI data
             pygame.mixer.music.play()
             self.playing = True
             
@@ -83,6 +86,7 @@ class MIDIPlayer:
         """Clean up pygame resources."""
         if self.initialized:
             try:
+                self._loaded_score = None
                 pygame.mixer.quit()
             except:
                 pass
@@ -1,82 +1,308 @@
-"""Pitch detection using librosa's pYIN algorithm."""
+"""Pitch detection using librosa's pYIN algorithm, or CREPE on a GPU."""
 
+import atexit
+import hashlib
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 import numpy as np
 import librosa
-from scipy import signal
-from typing import Tuple, List
+from scipy import ndimage
+from typing import Optional, Tuple
 from dataclasses import dataclass
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+try:
+    import torch
+    import torchcrepe
+    TORCHCREPE_AVAILABLE = True
+except ImportError:
+    TORCHCREPE_AVAILABLE = False
 
 from utils.config import (
-    SAMPLE_RATE, PITCH_CONFIDENCE_THRESHOLD, PITCH_SMOOTH_WINDOW
+    SAMPLE_RATE, PITCH_CONFIDENCE_THRESHOLD, PITCH_SMOOTH_WINDOW, PITCH_CACHE_DIR,
+    PITCH_CACHE_MAX_FILES, PITCH_PARALLEL_MIN_SECONDS, PITCH_CHUNK_SECONDS,
+    PITCH_CHUNK_OVERLAP, PITCH_MAX_WORKERS, PITCH_RANGE_MARGIN, PITCH_RESOLUTION
 )
 
+# pYIN analysis frame
+FRAME_LENGTH = 2048
+HOP_LENGTH = 512  # ~11.6ms hop at 44.1kHz
+
+# Constant term of the Hz -> MIDI conversion
+_MIDI_OFFSET = 69 - 12 * np.log2(440.0)
+
+# Frequency of every MIDI number, computed exactly as midi_to_hz does
+_MIDI_HZ_TABLE = tuple(440.0 * (2.0 ** ((i - 69) / 12.0)) for i in range(128))
+
+# Note names for every MIDI number (0 -> 'C-1' ... 127 -> 'G9')
+_NOTE_NAMES = ('C', 'C#', 'D', 'D#', 'E', 'F', 'F#', 'G', 'G#', 'A', 'A#', 'B')
+_NOTE_NAME_TABLE = tuple(f"{_NOTE_NAMES[i % 12]}{i // 12 - 1}" for i in range(128))
+_NOTE_NAME_ARRAY = np.array(_NOTE_NAME_TABLE)
+_PITCH_CLASS_ARRAY = np.array(_NOTE_NAMES)
+
+# Column layout of PitchAnalysis.data
+_TIME, _FREQUENCY, _CONFIDENCE, _MIDI = range(4)
+
+
+if NUMBA_AVAILABLE:
+    # Explicit signatures compile the kernels at import instead of on the
+    # first detect() call
+
+    @njit('int64(float64[:], float64[:], boolean[:], float64[:], float64, float64[:, :])')
+    def _select_frames(times, f0, voiced_flag, confidences, threshold, out):
+        """
+        Gather voiced frames above the confidence threshold in one pass.
+
+        Writes time, frequency and confidence rows into out and returns
+        the number of frames kept.
+        """
+        count = 0
+        for i in range(f0.size):
+            if voiced_flag[i] and confidences[i] > threshold:
+                out[count, _TIME] = times[i]
+                out[count, _FREQUENCY] = f0[i]
+                out[count, _CONFIDENCE] = confidences[i]
+                count += 1
+        return count
+
+    @njit('float64(float64, float64, float64)')
+    def _median3(a, b, c):
+        """Median of three values with min/max only (no branches)."""
+        return max(min(a, b), min(max(a, b), c))
+
+    @njit('float64(float64, float64, float64, float64, float64)')
+    def _median5(a, b, c, d, e):
+        """Median of five values with a min/max comparator network."""
+        return _median3(e, max(min(a, b), min(c, d)), min(max(a, b), max(c, d)))
+
+    @njit('void(float64[:], int64, float64[:])')
+    def _smooth_to_midi(frequencies, window, midi_notes):
+        """
+        Median-filter frequencies in place and write their MIDI numbers.
+
+        Matches scipy.ndimage.median_filter with mode='nearest' (edges
+        repeat the first/last frame); a window of 1 leaves the frequencies
+        unsmoothed. The original values in the window are kept in a ring
+        buffer since the frequencies are overwritten as we go. Windows of 3
+        and 5 take the median of the ring with a comparator network; wider
+        windows are kept sorted as they slide, swapping the frame leaving
+        the window for the one entering it and shifting it into place
+        instead of sorting every window from scratch.
+        """
+        n = frequencies.size
+        half = window // 2
+        ring = np.empty(window)
+        ordered = np.empty(window)
+        for k in range(window):
+            value = frequencies[min(max(k - half, 0), n - 1)]
+            ring[k] = value
+            m = k - 1
+            while m >= 0 and ordered[m] > value:
+                ordered[m + 1] = ordered[m]
+                m -= 1
+            ordered[m + 1] = value
+        for i in range(n):
+            if i > 0:
+                # Frame i + half has not been overwritten yet
+                incoming = frequencies[min(i + half, n - 1)]
+                slot = (i - 1) % window
+                outgoing = ring[slot]
+                ring[slot] = incoming
+                if window != 3 and window != 5:
+                    # Binary search for the outgoing value, then shift the
+                    # incoming one left or right to restore the order
+                    lo = 0
+                    hi = window
+                    while lo < hi:
+                        mid = (lo + hi) // 2
+                        if ordered[mid] < outgoing:
+                            lo = mid + 1
+                        else:
+                            hi = mid
+                    m = lo
+                    while m > 0 and ordered[m - 1] > incoming:
+                        ordered[m] = ordered[m - 1]
+                        m -= 1
+                    while m < window - 1 and ordered[m + 1] < incoming:
+                        ordered[m] = ordered[m + 1]
+                        m += 1
+                    ordered[m] = incoming
+            if window == 3:
+                freq = _median3(ring[0], ring[1], ring[2])
+            elif window == 5:
+                freq = _median5(ring[0], ring[1], ring[2], ring[3], ring[4])
+            else:
+                freq = ordered[half]
+            frequencies[i] = freq
+            midi_notes[i] = 12.0 * np.log2(max(freq, 1e-10)) + _MIDI_OFFSET
+
+
+def _run_pyin(audio: np.ndarray, sr: int, fmin: float, fmax: float):
+    """Run librosa's pYIN with the detector's frame settings (module level so worker processes can call it)."""
+    # pYIN is a probabilistic version of YIN, robust for monophonic pitch
+    return librosa.pyin(
+        audio,
+        fmin=fmin,
+        fmax=fmax,
+        sr=sr,
+        frame_length=FRAME_LENGTH,
+        hop_length=HOP_LENGTH,
+        # Step of the candidate pitch grid in semitones; the Viterbi decode
+        # that dominates pYIN's run time scales with the number of candidates
+        resolution=PITCH_RESOLUTION
+    )
+
 
 @dataclass
 class PitchAnalysis:
-    """Results of pitch detection."""
-    times: np.ndarray  # Time stamps in seconds
-    frequencies: np.ndarray  # Fundamental frequencies in Hz
-    confidences: np.ndarray  # Confidence scores (0-1)
-    midi_notes: np.ndarray  # MIDI note numbers (can be float for microtones)
+    """
+    Results of pitch detection.
+    
+    One row per analysed frame, so the values for a frame sit together in
+    memory; the named attributes are column views into the same array.
+    """
+    data: np.ndarray  # shape (N, 4): time, frequency, confidence, MIDI note
+    
+    @property
+    def times(self) -> np.ndarray:
+        """Time stamps in seconds."""
+        return self.data[:, _TIME]
+    
+    @property
+    def frequencies(self) -> np.ndarray:
+        """Fundamental frequencies in Hz."""
+        return self.data[:, _FREQUENCY]
+    
+    @property
+    def confidences(self) -> np.ndarray:
+        """Confidence scores (0-1)."""
+        return self.data[:, _CONFIDENCE]
+    
+    @property
+    def midi_notes(self) -> np.ndarray:
+        """MIDI note numbers (can be float for microtones)."""
+        return self.data[:, _MIDI]
 
 
 class PitchDetector:
-    """Detects pitch from monophonic audio using librosa's pYIN."""
+    """Detects pitch from monophonic audio using librosa's pYIN or torchcrepe."""
     
-    def __init__(self, fmin=50.0, fmax=2000.0):
+    def __init__(self, fmin=50.0, fmax=2000.0, cache_dir=PITCH_CACHE_DIR, warm_up=True,
+                 backend='auto'):
         """
         Initialize pitch detector.
         
         Args:
             fmin: Minimum frequency in Hz (default: 50 Hz, ~G1)
             fmax: Maximum frequency in Hz (default: 2000 Hz, ~B6)
+            cache_dir: Directory for cached pYIN results (None disables caching)
+            warm_up: Run pitch tracking once on silence so the first detect()
+                is not slowed down by JIT compilation or model loading
+            backend: 'librosa' (pYIN on the CPU), 'torchcrepe' (CREPE on a
+                CUDA GPU) or 'auto' to use torchcrepe when a GPU is available
         """
         self.fmin = fmin
         self.fmax = fmax
+        self.cache_dir = cache_dir
+        self._executor = None
+        
+        if backend == 'auto':
+            if TORCHCREPE_AVAILABLE and torch.cuda.is_available():
+                backend = 'torchcrepe'
+            else:
+                backend = 'librosa'
+        elif backend == 'torchcrepe' and not TORCHCREPE_AVAILABLE:
+            print("torchcrepe not available, using librosa pYIN")
+            backend = 'librosa'
+        self.backend = backend
+        
+        if warm_up:
+            self.warm_up()
     
-    def detect(self, audio: np.ndarray, sr: int = SAMPLE_RATE) -> PitchAnalysis:
+    def _frequency_range(self, note_range: Optional[Tuple[str, str]]) -> Tuple[float, float]:
+        """
+        Frequency limits in Hz for a (lowest, highest) note range.
+        
+        Falls back to the detector's fmin/fmax when no range is given or
+        the note names cannot be parsed.
+        """
+        if note_range is None:
+            return self.fmin, self.fmax
+        
+        try:
+            fmin, fmax = librosa.note_to_hz(list(note_range))
+        except librosa.util.exceptions.ParameterError as e:
+            print(f"Pitch range error: {e}")
+            return self.fmin, self.fmax
+        
+        # Leave headroom for intonation and vibrato at the range edges
+        return float(fmin) / PITCH_RANGE_MARGIN, float(fmax) * PITCH_RANGE_MARGIN
+    
+    def warm_up(self, sr: int = SAMPLE_RATE):
+        """Compile and load the tracker's internals by analysing half a second of silence."""
+        self._track(np.zeros(sr // 2, dtype=np.float32), sr, self.fmin, self.fmax)
+    
+    def detect(self, audio: np.ndarray, sr: int = SAMPLE_RATE,
+               note_range: Optional[Tuple[str, str]] = None) -> PitchAnalysis:
         """
         Detect pitch from audio.
         
         Args:
             audio: Audio signal as numpy array
             sr: Sample rate
+            note_range: (lowest, highest) note names, e.g. ('C2', 'C6'), to
+                limit detection to an instrument's range; None searches
+                fmin to fmax. pYIN's per-frame work grows with the number of
+                candidate pitches, so a tight range is faster as well as
+                less prone to octave errors. The range applies to this call
+                only, so a detector can be shared between threads.
         
         Returns:
             PitchAnalysis object with times, frequencies, confidences, and MIDI notes
         """
         if len(audio) == 0:
-            return PitchAnalysis(
-                times=np.array([]),
-                frequencies=np.array([]),
-                confidences=np.array([]),
-                midi_notes=np.array([])
-            )
+            return PitchAnalysis(np.empty((0, 4)))
         
-        # Use librosa's pYIN for pitch detection
-        # pYIN is a probabilistic version of YIN, robust for monophonic pitch
-        f0, voiced_flag, voiced_probs = librosa.pyin(
-            audio,
-            fmin=self.fmin,
-            fmax=self.fmax,
-            sr=sr,
-            frame_length=2048,
-            hop_length=512  # ~11.6ms hop at 44.1kHz
-        )
+        # Analyse in the recorder's float32 so the same take always hashes
+        # to the same cache entry; no copy when it already is float32
+        audio = np.asarray(audio, dtype=np.float32)
+        
+        fmin, fmax = self._frequency_range(note_range)
+        f0, voiced_flag, voiced_probs = self._pyin(audio, sr, fmin, fmax)
         
         # Create time array
-        hop_length = 512
-        times = librosa.frames_to_time(np.arange(len(f0)), sr=sr, hop_length=hop_length)
+        times = librosa.frames_to_time(np.arange(len(f0)), sr=sr, hop_length=HOP_LENGTH)
         
         # Use voiced probabilities as confidence
         confidences = voiced_probs
         
+        # Single output buffer for all per-frame values
+        data = np.empty((len(f0), 4))
+        
         # Filter out unvoiced frames and low confidence
-        valid_mask = (voiced_flag) & (confidences > PITCH_CONFIDENCE_THRESHOLD)
+        if NUMBA_AVAILABLE:
+            count = _select_frames(
+                times, f0, voiced_flag, confidences, PITCH_CONFIDENCE_THRESHOLD, data
+            )
+            data = data[:count]
+        else:
+            # Decode the mask once and gather each column straight into the buffer
+            valid_indices = np.flatnonzero(
+                voiced_flag & (confidences > PITCH_CONFIDENCE_THRESHOLD)
+            )
+            
+            data = data[:valid_indices.size]
+            np.take(times, valid_indices, out=data[:, _TIME])
+            np.take(f0, valid_indices, out=data[:, _FREQUENCY])
+            np.take(confidences, valid_indices, out=data[:, _CONFIDENCE])
         
-        times = times[valid_mask]
-        frequencies = f0[valid_mask]
-        confidences = confidences[valid_mask]
+        times = data[:, _TIME]
+        frequencies = data[:, _FREQUENCY]
         
         # Replace NaN frequencies with interpolation
         if len(frequencies) > 0:
@@ -85,53 +311,239 @@ class PitchDetector:
                 # Interpolate over NaNs
                 if np.all(nan_mask):
                     # All NaN, can't interpolate
-                    frequencies = np.full_like(frequencies, 440.0)
+                    frequencies[:] = 440.0
                 else:
-                    valid_indices = np.where(~nan_mask)[0]
-                    if len(valid_indices) > 1:
-                        from scipy.interpolate import interp1d
-                        f = interp1d(
-                            times[~nan_mask], 
-                            frequencies[~nan_mask],
-                            kind='linear',
-                            fill_value='extrapolate'
-                        )
-                        frequencies[nan_mask] = f(times[nan_mask])
-                    else:
-                        frequencies[nan_mask] = frequencies[~nan_mask][0]
-        
-        # Smooth frequencies with median filter
-        if len(frequencies) > PITCH_SMOOTH_WINDOW:
-            frequencies = signal.medfilt(frequencies, kernel_size=PITCH_SMOOTH_WINDOW)
-        
-        # Convert Hz to MIDI note numbers
-        midi_notes = self._hz_to_midi(frequencies)
-        
-        return PitchAnalysis(
-            times=times,
-            frequencies=frequencies,
-            confidences=confidences,
-            midi_notes=midi_notes
-        )
+                    # Frames outside the voiced range take the nearest
+                    # valid frequency (a single valid frame fills everything)
+                    valid_mask = ~nan_mask
+                    frequencies[nan_mask] = np.interp(
+                        times[nan_mask], times[valid_mask], frequencies[valid_mask]
+                    )
+        
+        # Smooth frequencies with median filter and convert Hz to MIDI note numbers
+        window = PITCH_SMOOTH_WINDOW if len(frequencies) > PITCH_SMOOTH_WINDOW else 1
+        if NUMBA_AVAILABLE:
+            _smooth_to_midi(frequencies, window, data[:, _MIDI])
+        else:
+            if window > 1:
+                frequencies[:] = ndimage.median_filter(frequencies, size=window, mode='nearest')
+            data[:, _MIDI] = self._hz_to_midi(frequencies)
+        
+        return PitchAnalysis(data)
+    
+    def _pyin(self, audio: np.ndarray, sr: int, fmin: float,
+              fmax: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Run the pitch tracker, reusing a cached result for identical audio and settings.
+        
+        Results are stored as .npz files named by a BLAKE2b hash of the
+        audio samples and analysis parameters. Only the PITCH_CACHE_MAX_FILES
+        most recently used entries are kept.
+        """
+        cache_path = None
+        if self.cache_dir:
+            audio = np.ascontiguousarray(audio)
+            key = hashlib.blake2b(audio, digest_size=16)
+            key.update(repr((
+                self.backend, audio.dtype.str, sr, fmin, fmax,
+                FRAME_LENGTH, HOP_LENGTH, PITCH_RESOLUTION
+            )).encode())
+            cache_path = os.path.join(self.cache_dir, f"{key.hexdigest()}.npz")
+            try:
+                with np.load(cache_path) as cached:
+                    result = cached['f0'], cached['voiced_flag'], cached['voiced_probs']
+            except FileNotFoundError:
+                pass
+            except Exception as e:
+                print(f"Pitch cache read error: {e}")
+            else:
+                # Mark the entry as recently used so pruning keeps it
+                try:
+                    os.utime(cache_path)
+                except OSError:
+                    pass
+                return result
+        
+        f0, voiced_flag, voiced_probs = self._track(audio, sr, fmin, fmax)
+        
+        if cache_path:
+            try:
+                os.makedirs(self.cache_dir, exist_ok=True)
+                # Write to a temporary file first so readers never see a partial entry
+                temp_path = f"{cache_path}.{os.getpid()}.tmp"
+                with open(temp_path, 'wb') as f:
+                    np.savez(f, f0=f0, voiced_flag=voiced_flag, voiced_probs=voiced_probs)
+                os.replace(temp_path, cache_path)
+            except OSError as e:
+                print(f"Pitch cache write error: {e}")
+            else:
+                self._prune_cache()
+        
+        return f0, voiced_flag, voiced_probs
+    
+    def _prune_cache(self):
+        """Delete the least recently used cache entries beyond PITCH_CACHE_MAX_FILES."""
+        try:
+            entries = [
+                (entry.stat().st_mtime, entry.path)
+                for entry in os.scandir(self.cache_dir)
+                if entry.name.endswith('.npz')
+            ]
+        except OSError as e:
+            print(f"Pitch cache prune error: {e}")
+            return
+        
+        if len(entries) <= PITCH_CACHE_MAX_FILES:
+            return
+        
+        entries.sort(reverse=True)
+        for _, path in entries[PITCH_CACHE_MAX_FILES:]:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass  # already removed by another instance
+            except OSError as e:
+                print(f"Pitch cache prune error: {e}")
+    
+    def _track(self, audio: np.ndarray, sr: int, fmin: float,
+               fmax: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Run the configured pitch tracker, returning f0, voiced flags and probabilities."""
+        if self.backend == 'torchcrepe':
+            # CREPE on the GPU; its periodicity stands in for pYIN's voicing
+            # probability and every frame counts as voiced, so frames are
+            # kept or dropped by the confidence threshold alone
+            audio_tensor = torch.from_numpy(
+                np.ascontiguousarray(audio, dtype=np.float32)
+            )[None].cuda()
+            f0, periodicity = torchcrepe.predict(
+                audio_tensor,
+                sr,
+                hop_length=HOP_LENGTH,
+                fmin=fmin,
+                fmax=fmax,
+                model='full',
+                return_periodicity=True,
+                batch_size=2048,
+                device='cuda'
+            )
+            f0 = f0[0].cpu().numpy().astype(np.float64)
+            voiced_probs = periodicity[0].cpu().numpy().astype(np.float64)
+            return f0, np.ones(f0.shape, dtype=bool), voiced_probs
+        
+        # Use librosa's pYIN for pitch detection
+        if len(audio) > PITCH_PARALLEL_MIN_SECONDS * sr and (os.cpu_count() or 1) > 1:
+            try:
+                return self._pyin_parallel(audio, sr, fmin, fmax)
+            except BrokenProcessPool as e:
+                # Workers died, e.g. spawned from a script without a
+                # __main__ guard; analyse in this process instead
+                print(f"Parallel pitch detection error: {e}")
+                self._executor = None
+        return _run_pyin(audio, sr, fmin, fmax)
+    
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """
+        Process pool for parallel pYIN, created by the first take long enough to need it.
+        
+        Workers are started as chunks are submitted, up to
+        PITCH_MAX_WORKERS, and each one imports librosa, so shorter takes
+        never pay for them.
+        """
+        if self._executor is None:
+            # Spawn fresh interpreters: forking from the transcription
+            # thread would copy the Qt application and any locks other
+            # threads hold at that moment into the workers
+            self._executor = ProcessPoolExecutor(
+                max_workers=min(os.cpu_count() or 1, PITCH_MAX_WORKERS),
+                mp_context=multiprocessing.get_context('spawn')
+            )
+            atexit.register(self._executor.shutdown)
+        return self._executor
+    
+    def _pyin_parallel(self, audio: np.ndarray, sr: int, fmin: float,
+                       fmax: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Run pYIN on overlapping chunks in worker processes and stitch the results.
+        
+        Chunks start on frame boundaries, so chunk frames line up with the
+        frames of a single pYIN run over the whole signal. Each chunk gets
+        PITCH_CHUNK_OVERLAP seconds of extra audio on both sides, which is
+        analysed and then dropped, so decoding near a boundary still sees
+        the neighbouring audio.
+        """
+        executor = self._get_executor()
+        
+        n_frames = 1 + len(audio) // HOP_LENGTH
+        chunk_frames = max(1, int(PITCH_CHUNK_SECONDS * sr) // HOP_LENGTH)
+        overlap_frames = int(np.ceil(PITCH_CHUNK_OVERLAP * sr / HOP_LENGTH))
+        
+        chunks = []
+        for first in range(0, n_frames, chunk_frames):
+            lead = min(overlap_frames, first)
+            start = (first - lead) * HOP_LENGTH
+            end = min((first + chunk_frames + overlap_frames) * HOP_LENGTH, len(audio))
+            future = executor.submit(_run_pyin, audio[start:end], sr, fmin, fmax)
+            chunks.append((first, lead, future))
+        
+        f0 = np.empty(n_frames)
+        voiced_flag = np.empty(n_frames, dtype=bool)
+        voiced_probs = np.empty(n_frames)
+        for first, lead, future in chunks:
+            count = min(chunk_frames, n_frames - first)
+            chunk_f0, chunk_voiced, chunk_probs = future.result()
+            f0[first:first + count] = chunk_f0[lead:lead + count]
+            voiced_flag[first:first + count] = chunk_voiced[lead:lead + count]
+            voiced_probs[first:first + count] = chunk_probs[lead:lead + count]
+        
+        return f0, voiced_flag, voiced_probs
     
     @staticmethod
     def _hz_to_midi(frequencies: np.ndarray) -> np.ndarray:
         """Convert frequencies in Hz to MIDI note numbers."""
-        # MIDI note number = 69 + 12 * log2(f / 440)
-        # Handle zeros to avoid log of zero
-        frequencies = np.maximum(frequencies, 1e-10)
-        midi_notes = 69 + 12 * np.log2(frequencies / 440.0)
+        # MIDI note number = 69 + 12 * log2(f / 440) = 12 * log2(f) + (69 - 12 * log2(440))
+        # Handle zeros to avoid log of zero; the clipped copy is the only
+        # allocation, the remaining steps run in place on it
+        midi_notes = np.maximum(frequencies, 1e-10)
+        np.log2(midi_notes, out=midi_notes)
+        midi_notes *= 12
+        midi_notes += _MIDI_OFFSET
         return midi_notes
     
     @staticmethod
     def midi_to_hz(midi_note: float) -> float:
         """Convert MIDI note number to frequency in Hz."""
+        if type(midi_note) is int and 0 <= midi_note < 128:
+            return _MIDI_HZ_TABLE[midi_note]
         return 440.0 * (2.0 ** ((midi_note - 69) / 12.0))
     
+    @staticmethod
+    def midi_to_hz_array(midi_notes: np.ndarray) -> np.ndarray:
+        """Convert an array of MIDI note numbers to frequencies in Hz."""
+        return 440.0 * np.exp2((np.asarray(midi_notes, dtype=float) - 69.0) * (1.0 / 12.0))
+    
     @staticmethod
     def midi_to_note_name(midi_note: int) -> str:
         """Convert MIDI note number to note name (e.g., 60 -> 'C4')."""
-        note_names = ['C', 'C#', 'D', 'D#', 'E', 'F', 'F#', 'G', 'G#', 'A', 'A#', 'B']
+        midi_note = int(midi_note)
+        if 0 <= midi_note < 128:
+            return _NOTE_NAME_TABLE[midi_note]
         octave = (midi_note // 12) - 1
-        note = note_names[midi_note % 12]
+        note = _NOTE_NAMES[midi_note % 12]
         return f"{note}{octave}"
+    
+    @staticmethod
+    def midi_to_note_names(midi_notes: np.ndarray) -> np.ndarray:
+        """
+        Convert an array of MIDI note numbers to note names.
+        
+        Args:
+            midi_notes: MIDI note numbers (floats are truncated like int())
+        
+        Returns:
+            Array of note names with the same shape (e.g., [60, 61] -> ['C4', 'C#4'])
+        """
+        midi_notes = np.asarray(midi_notes).astype(np.int64)
+        if midi_notes.size == 0 or (midi_notes.min() >= 0 and midi_notes.max() < 128):
+            return _NOTE_NAME_ARRAY[midi_notes]
+        octaves = midi_notes // 12 - 1
+        return np.char.add(_PITCH_CLASS_ARRAY[midi_notes % 12], octaves.astype(str))
@@ -1,27 +1,54 @@
 """Audio recording with level monitoring."""
 
+import math
 import numpy as np
 import sounddevice as sd
 from typing import Optional, Tuple, Callable
+import queue
 import threading
-import time
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
 
 from utils.config import (
-    SAMPLE_RATE, CHANNELS, DTYPE,
+    SAMPLE_RATE, CHANNELS, DTYPE, RECORD_BUFFER_SECONDS,
     CLIPPING_THRESHOLD, TOO_QUIET_THRESHOLD
 )
 
+# Amplitude -> dBFS factor for natural logs: 20 * log10(x) == _TO_DB * ln(x)
+_TO_DB = 20.0 / math.log(10.0)
+
+
+if NUMBA_AVAILABLE:
+
+    @njit('UniTuple(float64, 2)(float32[:, ::1])', fastmath=True)
+    def _rms_peak(block):
+        """RMS and peak absolute value of a block in a single pass."""
+        samples = block.ravel()
+        total = 0.0
+        peak = np.float32(0.0)
+        for i in range(samples.size):
+            value = samples[i]
+            total += value * value
+            peak = max(peak, abs(value))
+        return math.sqrt(total / max(samples.size, 1)), peak
+
 
 class AudioRecorder:
     """Handles audio recording with real-time level monitoring."""
     
     def __init__(self):
         self.is_recording = False
-        self.recorded_frames = []
+        self._buffer = None
+        self._write_pos = 0
         self.current_rms = -80.0
         self.current_peak = -80.0
         self.stream = None
         self.level_callbacks = []
+        self._level_queue = None
+        self._level_thread = None
         
     def start_recording(self, callback: Optional[Callable] = None):
         """Start recording audio."""
@@ -29,30 +56,32 @@ class AudioRecorder:
             return
         
         self.is_recording = True
-        self.recorded_frames = []
+        self._buffer = np.empty((SAMPLE_RATE * RECORD_BUFFER_SECONDS, CHANNELS), dtype=DTYPE)
+        self._write_pos = 0
+        
+        # Levels are metered on a separate thread so the audio callback
+        # only has to copy samples
+        self._level_queue = queue.SimpleQueue()
+        self._level_thread = threading.Thread(
+            target=self._meter_levels, args=(self._level_queue,), daemon=True
+        )
+        self._level_thread.start()
         
         def audio_callback(indata, frames, time_info, status):
             """Callback for audio stream."""
             if status:
                 print(f"Audio status: {status}")
             
-            # Store audio data
-            self.recorded_frames.append(indata.copy())
-            
-            # Calculate levels
-            rms = np.sqrt(np.mean(indata ** 2))
-            peak = np.max(np.abs(indata))
+            # Copy audio data into the recording buffer
+            n = len(indata)
+            if self._write_pos + n > len(self._buffer):
+                self._grow(self._write_pos + n)
+            self._buffer[self._write_pos:self._write_pos + n] = indata
+            self._write_pos += n
             
-            # Convert to dBFS
-            self.current_rms = 20 * np.log10(max(rms, 1e-10))
-            self.current_peak = 20 * np.log10(max(peak, 1e-10))
-            
-            # Notify level callbacks
-            for cb in self.level_callbacks:
-                try:
-                    cb(self.current_rms, self.current_peak)
-                except Exception as e:
-                    print(f"Level callback error: {e}")
+            # Hand the new block to the level meter; the view keeps its
+            # buffer alive even if the buffer grows in the meantime
+            self._level_queue.put(self._buffer[self._write_pos - n:self._write_pos])
         
         # Start audio stream
         self.stream = sd.InputStream(
@@ -78,12 +107,52 @@ class AudioRecorder:
             self.stream.close()
             self.stream = None
         
-        # Concatenate all frames
-        if self.recorded_frames:
-            audio_data = np.concatenate(self.recorded_frames, axis=0)
-            return audio_data.flatten()
-        else:
-            return np.array([], dtype=DTYPE)
+        # Let the level meter finish the queued blocks and exit
+        self._level_queue.put(None)
+        self._level_thread.join()
+        self._level_queue = None
+        self._level_thread = None
+        
+        # Copy out the recorded part and release the buffer
+        audio_data = self._buffer[:self._write_pos].flatten()
+        self._buffer = None
+        self._write_pos = 0
+        return audio_data
+    
+    def _grow(self, min_capacity: int):
+        """Double the recording buffer until it holds min_capacity frames."""
+        capacity = len(self._buffer) * 2
+        while capacity < min_capacity:
+            capacity *= 2
+        buffer = np.empty((capacity, CHANNELS), dtype=DTYPE)
+        buffer[:self._write_pos] = self._buffer[:self._write_pos]
+        self._buffer = buffer
+    
+    def _meter_levels(self, blocks: queue.SimpleQueue):
+        """Compute levels for recorded blocks until a None sentinel arrives."""
+        while True:
+            block = blocks.get()
+            if block is None:
+                return
+            
+            # Calculate levels in one pass; without numba, einsum squares
+            # and sums without a temporary
+            if NUMBA_AVAILABLE:
+                rms, peak = _rms_peak(block)
+            else:
+                rms = np.sqrt(np.einsum('ij,ij->', block, block) / max(block.size, 1))
+                peak = max(block.max(), -block.min()) if block.size else 0.0
+            
+            # Convert to dBFS (scalar math avoids NumPy ufunc dispatch)
+            self.current_rms = _TO_DB * math.log(max(rms, 1e-10))
+            self.current_peak = _TO_DB * math.log(max(peak, 1e-10))
+            
+            # Notify level callbacks
+            for cb in self.level_callbacks:
+                try:
+                    cb(self.current_rms, self.current_peak)
+                except Exception as e:
+                    print(f"Level callback error: {e}")
     
     def get_levels(self) -> Tuple[float, float]:
         """Get current RMS and peak levels in dBFS."""
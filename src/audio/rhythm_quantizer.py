@@ -1,7 +1,6 @@
 """Rhythm quantization and onset detection."""
 
 import numpy as np
-import librosa
 from typing import List, Tuple
 from dataclasses import dataclass
 
@@ -10,6 +9,9 @@ from utils.config import (
     MIN_NOTE_DURATION, QUANTIZATION_STRENGTH
 )
 
+# Valid note durations in quarter notes, longest first (ties snap longer)
+_VALID_DURATIONS = np.array([4.0, 3.0, 2.0, 1.5, 1.0, 0.75, 0.5, 0.375, 0.25])
+
 
 @dataclass
 class QuantizedNote:
@@ -22,12 +24,55 @@ class QuantizedNote:
     duration_beats: float  # duration in beats
 
 
+@dataclass
+class QuantizedNotes:
+    """
+    Quantized notes stored as parallel arrays, one entry per note.
+    
+    Keeps every field contiguous so timing and pitch work runs as whole-array
+    NumPy operations; as_list() gives QuantizedNote objects for code that
+    wants one object per note.
+    """
+    start_time: np.ndarray  # seconds
+    duration: np.ndarray  # seconds
+    midi_note: np.ndarray  # MIDI note numbers (rounded, int)
+    confidence: np.ndarray  # average confidence per note
+    start_beat: np.ndarray  # beat positions
+    duration_beats: np.ndarray  # durations in beats
+    
+    @classmethod
+    def empty(cls) -> 'QuantizedNotes':
+        """Create an empty note collection."""
+        return cls(
+            np.empty(0), np.empty(0), np.empty(0, dtype=int),
+            np.empty(0), np.empty(0), np.empty(0)
+        )
+    
+    def __len__(self) -> int:
+        return len(self.start_time)
+    
+    def as_list(self) -> List[QuantizedNote]:
+        """Convert to a list of QuantizedNote objects."""
+        return [
+            QuantizedNote(*fields)
+            for fields in zip(
+                self.start_time.tolist(),
+                self.duration.tolist(),
+                self.midi_note.tolist(),
+                self.confidence.tolist(),
+                self.start_beat.tolist(),
+                self.duration_beats.tolist()
+            )
+        ]
+
+
 class RhythmQuantizer:
     """Quantizes rhythm using onset detection and tempo."""
     
     def __init__(self):
         self.tempo_bpm = DEFAULT_TEMPO
         self.time_signature = DEFAULT_TIME_SIGNATURE
+        self._onset_cache = None  # (audio, sr, onset times) of the last recording
     
     def set_tempo(self, bpm: float):
         """Set tempo in beats per minute."""
@@ -44,7 +89,7 @@ class RhythmQuantizer:
         pitch_midi: np.ndarray,
         pitch_confidences: np.ndarray,
         sr: int = SAMPLE_RATE
-    ) -> List[QuantizedNote]:
+    ) -> QuantizedNotes:
         """
         Quantize rhythm from audio and pitch data.
         
@@ -56,19 +101,13 @@ class RhythmQuantizer:
             sr: Sample rate
         
         Returns:
-            List of quantized notes
+            Quantized notes
         """
         if len(audio) == 0 or len(pitch_times) == 0:
-            return []
+            return QuantizedNotes.empty()
         
         # Detect onsets
-        onset_frames = librosa.onset.onset_detect(
-            y=audio,
-            sr=sr,
-            units='frames',
-            backtrack=True
-        )
-        onset_times = librosa.frames_to_time(onset_frames, sr=sr)
+        onset_times = self._detect_onsets(audio, sr)
         
         # If no onsets detected, use pitch change points
         if len(onset_times) == 0:
@@ -87,6 +126,32 @@ class RhythmQuantizer:
         
         return quantized_notes
     
+    def _detect_onsets(self, audio: np.ndarray, sr: int) -> np.ndarray:
+        """
+        Detect onset times in seconds, reusing the result for the same recording.
+        
+        Re-transcribing a take with a different tempo, time signature or
+        instrument passes the same audio array again; its onsets do not
+        change, so the spectrogram and onset envelope are not recomputed.
+        """
+        cached = self._onset_cache
+        if cached is not None and cached[0] is audio and cached[1] == sr:
+            return cached[2]
+        
+        # Imported on first use so opening the window does not load librosa
+        import librosa
+        
+        onset_frames = librosa.onset.onset_detect(
+            y=audio,
+            sr=sr,
+            units='frames',
+            backtrack=True
+        )
+        onset_times = librosa.frames_to_time(onset_frames, sr=sr)
+        
+        self._onset_cache = (audio, sr, onset_times)
+        return onset_times
+    
     def _detect_pitch_changes(
         self,
         times: np.ndarray,
@@ -97,14 +162,17 @@ class RhythmQuantizer:
         if len(times) < 2:
             return np.array([times[0]] if len(times) > 0 else [])
         
-        # Calculate pitch differences
-        pitch_diff = np.abs(np.diff(midi_notes))
+        # Calculate pitch differences in a single scratch buffer
+        pitch_diff = np.subtract(midi_notes[1:], midi_notes[:-1])
+        np.abs(pitch_diff, out=pitch_diff)
         
-        # Find indices where pitch changes significantly
-        change_indices = np.where(pitch_diff > semitone_threshold)[0] + 1
+        # Find frames where pitch changes significantly
+        changed = pitch_diff > semitone_threshold
         
         # Always include the first time
-        change_times = np.concatenate([[times[0]], times[change_indices]])
+        change_times = np.empty(np.count_nonzero(changed) + 1, dtype=times.dtype)
+        change_times[0] = times[0]
+        np.compress(changed, times[1:], out=change_times[1:])
         
         return change_times
     
@@ -114,52 +182,56 @@ class RhythmQuantizer:
         pitch_times: np.ndarray,
         pitch_midi: np.ndarray,
         pitch_confidences: np.ndarray
-    ) -> List[QuantizedNote]:
+    ) -> QuantizedNotes:
         """Group pitch detections into notes based on onset times."""
-        notes = []
-        
         # Add final onset at end of audio
         onset_times = np.append(onset_times, pitch_times[-1] if len(pitch_times) > 0 else 0)
         
-        for i in range(len(onset_times) - 1):
-            start_time = onset_times[i]
-            end_time = onset_times[i + 1]
-            
-            # Find pitches in this time range
-            mask = (pitch_times >= start_time) & (pitch_times < end_time)
-            note_pitches = pitch_midi[mask]
-            note_confidences = pitch_confidences[mask]
-            
-            if len(note_pitches) == 0:
-                continue
-            
-            # Calculate average pitch (weighted by confidence)
-            if np.sum(note_confidences) > 0:
-                weighted_pitch = np.average(note_pitches, weights=note_confidences)
-            else:
-                weighted_pitch = np.mean(note_pitches)
-            
-            avg_confidence = np.mean(note_confidences)
-            duration = end_time - start_time
-            
-            # Skip very short notes
-            if duration < MIN_NOTE_DURATION:
-                continue
-            
-            notes.append(QuantizedNote(
-                start_time=start_time,
-                duration=duration,
-                midi_note=int(round(weighted_pitch)),
-                confidence=float(avg_confidence),
-                start_beat=0.0,  # Will be calculated in quantization
-                duration_beats=0.0
-            ))
+        # Pitch times are sorted, so each note's frames are the contiguous
+        # slice between the indices of consecutive onsets. The running
+        # maximum turns a final boundary that precedes the last onset into
+        # an empty note rather than a negative-length slice.
+        bounds = np.searchsorted(pitch_times, onset_times, side='left')
+        np.maximum.accumulate(bounds, out=bounds)
+        counts = np.diff(bounds)
+        durations = np.diff(onset_times)
         
-        return notes
+        # Sum every non-empty note in one pass; empty notes have zero width,
+        # so the non-empty starts alone delimit the groups
+        voiced = counts > 0
+        if not np.any(voiced):
+            return QuantizedNotes.empty()
+        starts = bounds[:-1][voiced]
+        end = bounds[-1]
+        note_midi = pitch_midi[:end]
+        note_confidences = pitch_confidences[:end]
+        confidence_sums = np.add.reduceat(note_confidences, starts)
+        weighted_sums = np.add.reduceat(note_midi * note_confidences, starts)
+        pitch_sums = np.add.reduceat(note_midi, starts)
+        sizes = counts[voiced]
+        
+        # Calculate average pitch (weighted by confidence)
+        weighted = confidence_sums > 0
+        pitches = np.divide(pitch_sums, sizes)
+        np.divide(weighted_sums, confidence_sums, out=pitches, where=weighted)
+        avg_confidences = confidence_sums / sizes
+        
+        # Skip very short notes
+        keep = durations[voiced] >= MIN_NOTE_DURATION
+        count = np.count_nonzero(keep)
+        
+        return QuantizedNotes(
+            start_time=onset_times[:-1][voiced][keep],
+            duration=durations[voiced][keep],
+            midi_note=np.rint(pitches[keep]).astype(int),
+            confidence=avg_confidences[keep],
+            start_beat=np.zeros(count),  # Will be calculated in quantization
+            duration_beats=np.zeros(count)
+        )
     
-    def _quantize_timings(self, notes: List[QuantizedNote]) -> List[QuantizedNote]:
+    def _quantize_timings(self, notes: QuantizedNotes) -> QuantizedNotes:
         """Quantize note timings to grid."""
-        if not notes:
+        if len(notes) == 0:
             return notes
         
         # Calculate beat duration in seconds
@@ -167,58 +239,49 @@ class RhythmQuantizer:
         
         # Define quantization grid (16th note resolution)
         grid_subdivision = 4  # 16th notes = quarter note / 4
-        grid_duration = beat_duration / grid_subdivision
-        
-        for note in notes:
-            # Convert times to beats
-            start_beat = note.start_time / beat_duration
-            duration_beats = note.duration / beat_duration
-            
-            # Quantize with partial strength
-            quantized_start_beat = self._quantize_value(
-                start_beat, 1.0 / grid_subdivision, QUANTIZATION_STRENGTH
-            )
-            quantized_duration_beats = self._quantize_value(
-                duration_beats, 1.0 / grid_subdivision, QUANTIZATION_STRENGTH
-            )
-            
-            # Ensure minimum duration
-            min_duration_beats = MIN_NOTE_DURATION / beat_duration
-            quantized_duration_beats = max(quantized_duration_beats, min_duration_beats)
-            
-            # Snap to valid musical duration
-            quantized_duration_beats = self._snap_to_valid_duration(quantized_duration_beats)
-            
-            note.start_beat = quantized_start_beat
-            note.duration_beats = quantized_duration_beats
-            
-            # Update time-domain values
-            note.start_time = quantized_start_beat * beat_duration
-            note.duration = quantized_duration_beats * beat_duration
+        
+        # Convert times to beats and quantize with partial strength
+        start_beats = self._quantize_value(
+            notes.start_time / beat_duration, 1.0 / grid_subdivision, QUANTIZATION_STRENGTH
+        )
+        duration_beats = self._quantize_value(
+            notes.duration / beat_duration, 1.0 / grid_subdivision, QUANTIZATION_STRENGTH
+        )
+        
+        # Ensure minimum duration, then snap to valid musical durations
+        np.maximum(duration_beats, MIN_NOTE_DURATION / beat_duration, out=duration_beats)
+        duration_beats = self._snap_to_valid_duration(duration_beats)
+        
+        notes.start_beat = start_beats
+        notes.duration_beats = duration_beats
+        
+        # Update time-domain values
+        notes.start_time = start_beats * beat_duration
+        notes.duration = duration_beats * beat_duration
         
         return notes
     
-    def _snap_to_valid_duration(self, duration: float) -> float:
+    @staticmethod
+    def _snap_to_valid_duration(durations: np.ndarray) -> np.ndarray:
         """
-        Snap duration to nearest valid musical note value.
+        Snap durations to the nearest valid musical note values.
         
         Valid durations in quarter notes:
         - 4.0 (whole), 3.0 (dotted half), 2.0 (half)
         - 1.5 (dotted quarter), 1.0 (quarter)
         - 0.75 (dotted eighth), 0.5 (eighth)
         - 0.375 (dotted sixteenth), 0.25 (sixteenth)
-        """
-        if duration <= 0:
-            return 0.25
-        
-        valid_durations = [4.0, 3.0, 2.0, 1.5, 1.0, 0.75, 0.5, 0.375, 0.25]
         
-        # Find closest valid duration
-        closest = min(valid_durations, key=lambda x: abs(x - duration))
+        Non-positive durations become a sixteenth.
+        """
+        # Find closest valid duration (argmin keeps the longer one on ties)
+        distances = np.abs(_VALID_DURATIONS - durations[:, np.newaxis])
+        closest = _VALID_DURATIONS[np.argmin(distances, axis=1)]
+        closest[durations <= 0] = 0.25
         return closest
     
     @staticmethod
-    def _quantize_value(value: float, grid: float, strength: float) -> float:
-        """Quantize a value to a grid with given strength."""
-        quantized = round(value / grid) * grid
+    def _quantize_value(value: np.ndarray, grid: float, strength: float) -> np.ndarray:
+        """Quantize values to a grid with given strength."""
+        quantized = np.rint(value / grid) * grid
         return value * (1 - strength) + quantized * strength
@@ -1,9 +1,31 @@
 """PDF exporter for music21 scores using MuseScore for graphical sheet music."""
 from pathlib import Path
 from music21 import stream, environment
+import functools
 import subprocess
 import shutil
 
+# Set once music21's user settings point at MuseScore (writes a settings file)
+_musescore_configured = False
+
+
+@functools.lru_cache(maxsize=1)
+def _find_musescore():
+    """Return the first MuseScore executable found, or None."""
+    # Try multiple possible MuseScore locations
+    musescore_paths = [
+        '/Applications/MuseScore 4.app/Contents/MacOS/mscore',
+        '/Applications/MuseScore 3.app/Contents/MacOS/mscore',
+        '/usr/local/bin/mscore',
+        shutil.which('mscore'),
+        shutil.which('musescore')
+    ]
+    
+    for path in musescore_paths:
+        if path and Path(path).exists():
+            return path
+    return None
+
 
 class PDFExporter:
     """Export music21 scores to PDF format with proper sheet music notation."""
@@ -14,27 +36,17 @@ class PDFExporter:
     
     def _configure_musescore(self):
         """Configure music21 to use MuseScore for PDF rendering."""
+        global _musescore_configured
         try:
-            # Try multiple possible MuseScore locations
-            musescore_paths = [
-                '/Applications/MuseScore 4.app/Contents/MacOS/mscore',
-                '/Applications/MuseScore 3.app/Contents/MacOS/mscore',
-                '/usr/local/bin/mscore',
-                shutil.which('mscore'),
-                shutil.which('musescore')
-            ]
-            
-            musescore_path = None
-            for path in musescore_paths:
-                if path and Path(path).exists():
-                    musescore_path = path
-                    break
+            musescore_path = _find_musescore()
             
             if musescore_path:
                 # Configure music21 environment
-                env = environment.UserSettings()
-                env['musescoreDirectPNGPath'] = musescore_path
-                env['musicxmlPath'] = musescore_path
+                if not _musescore_configured:
+                    env = environment.UserSettings()
+                    env['musescoreDirectPNGPath'] = musescore_path
+                    env['musicxmlPath'] = musescore_path
+                    _musescore_configured = True
                 self.musescore_available = True
                 self.musescore_path = musescore_path
             else:
@@ -1,5 +1,6 @@
 """Main application entry point."""
 
+import multiprocessing
 import sys
 from PySide6.QtWidgets import QApplication
 
@@ -19,4 +20,7 @@ def main():
 
 
 if __name__ == '__main__':
+    # Pitch detection runs pYIN in worker processes; frozen builds need
+    # this so a worker doesn't start another copy of the app
+    multiprocessing.freeze_support()
     main()
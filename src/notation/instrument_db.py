@@ -1,20 +1,54 @@
 """Instrument database loader and query interface."""
 
+import bisect
+import functools
 import json
 import os
+import sys
 from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass
 
+from utils.config import INSTRUMENTS_DB_PATH
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Base directory for relative database paths: the PyInstaller bundle when
+# frozen, otherwise src/
+if getattr(sys, 'frozen', False):
+    _BASE_PATH = sys._MEIPASS
+else:
+    _BASE_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Frozen builds import the database precompiled by embed_instruments.py.
+# Source checkouts always read the JSON: build.sh leaves the generated
+# module behind, and it goes stale as soon as the JSON is edited.
+EMBEDDED_INSTRUMENTS = None
+if getattr(sys, 'frozen', False):
+    try:
+        from notation.instruments_data import INSTRUMENTS as EMBEDDED_INSTRUMENTS
+    except ImportError:
+        pass
+
+# Pitch thresholds used by the clef heuristic. Every comparison is against one
+# of these, so pitches in the same interval between them get the same clef.
+_CLEF_PITCH_THRESHOLDS = (48, 50, 60, 64, 67)
+# One pitch from each interval, indexed by bisect_right over the thresholds
+_CLEF_BUCKET_PITCHES = (47, 48, 50, 60, 64, 67)
 
-@dataclass
+
+@dataclass(slots=True, frozen=True)
 class Instrument:
-    """Represents a musical instrument with all metadata."""
+    """Represents a musical instrument with all metadata (immutable and hashable)."""
     id: str
     name: str
     family: str
     transposition_type: str
     transposition_semitones: int
-    clefs: List[str]
+    clefs: Tuple[str, ...]
     sounding_range: Tuple[str, str]
     written_range: Tuple[str, str]
     preferred_range: Tuple[str, str]
@@ -23,73 +57,129 @@ class Instrument:
     lyrics_support: bool = False
 
 
+@functools.lru_cache(maxsize=1024)
+def _clef_for_pitch_bucket(clefs: Tuple[str, ...], bucket: int) -> str:
+    """Pick a clef from several for a pitch bucket (cached)."""
+    avg_pitch_midi = _CLEF_BUCKET_PITCHES[bucket]
+    
+    # Select clef based on average pitch
+    # This is a simplified heuristic
+    if 'treble' in clefs and avg_pitch_midi >= 60:  # Middle C and above
+        return 'treble'
+    elif 'bass' in clefs and avg_pitch_midi < 60:
+        return 'bass'
+    elif 'alto' in clefs and 48 <= avg_pitch_midi < 67:
+        return 'alto'
+    elif 'tenor' in clefs and 50 <= avg_pitch_midi < 64:
+        return 'tenor'
+    
+    return clefs[0]
+
+
 class InstrumentDatabase:
     """Loads and queries instrument metadata."""
     
     def __init__(self, db_path: str):
         """Load instrument database from JSON file."""
-        self.instruments: Dict[str, Instrument] = {}
+        self.instruments: Dict[str, Instrument] = {}  # materialized so far
+        self._raw: Dict[str, dict] = {}
+        self._family_ids: Dict[str, List[str]] = {}
+        # Sorted query results, computed on first use (instruments only change
+        # while loading); callers get copies so they cannot alter the cache
+        self._all_instruments_cache: Optional[List[Instrument]] = None
+        self._families_cache: Optional[List[str]] = None
+        self._by_family_cache: Dict[str, List[Instrument]] = {}
         self._load_database(db_path)
     
     def _load_database(self, db_path: str):
         """Load instruments from JSON file."""
-        # Handle both absolute and relative paths
-        if not os.path.isabs(db_path):
-            # For PyInstaller, check if we're in a bundle
-            if getattr(sys, 'frozen', False):
-                base_path = sys._MEIPASS
+        if db_path == INSTRUMENTS_DB_PATH and EMBEDDED_INSTRUMENTS is not None:
+            # Bundled database compiled into a module at build time
+            instruments_data = EMBEDDED_INSTRUMENTS
+        else:
+            # Handle both absolute and relative paths
+            if not os.path.isabs(db_path):
+                db_path = os.path.join(_BASE_PATH, db_path)
+            
+            if ORJSON_AVAILABLE:
+                # C parser, several times faster than json on this file
+                with open(db_path, 'rb') as f:
+                    data = orjson.loads(f.read())
             else:
-                base_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-            db_path = os.path.join(base_path, db_path)
-        
-        with open(db_path, 'r') as f:
-            data = json.load(f)
+                with open(db_path, 'r') as f:
+                    data = json.load(f)
+            instruments_data = data['instruments']
         
-        for inst_data in data['instruments']:
-            inst = Instrument(
-                id=inst_data['id'],
-                name=inst_data['name'],
-                family=inst_data['family'],
-                transposition_type=inst_data['transposition']['type'],
-                transposition_semitones=inst_data['transposition']['semitones'],
-                clefs=inst_data['clefs'],
-                sounding_range=(
-                    inst_data['sounding_range']['lowest'],
-                    inst_data['sounding_range']['highest']
-                ),
-                written_range=(
-                    inst_data['written_range']['lowest'],
-                    inst_data['written_range']['highest']
-                ),
-                preferred_range=(
-                    inst_data['preferred_range']['lowest'],
-                    inst_data['preferred_range']['highest']
-                ),
-                octave_displacement=inst_data['octave_displacement'],
-                midi_program=inst_data['midi_program'],
-                lyrics_support=inst_data.get('lyrics_support', False)
-            )
-            self.instruments[inst.id] = inst
+        # Instrument objects are created on first access; loading only
+        # indexes the raw entries by id and family
+        for inst_data in instruments_data:
+            self._raw[inst_data['id']] = inst_data
+        for inst_id, inst_data in self._raw.items():
+            self._family_ids.setdefault(sys.intern(inst_data['family']), []).append(inst_id)
+    
+    def _materialize(self, inst_data: dict) -> Instrument:
+        """Create an Instrument from its database entry."""
+        return Instrument(
+            id=inst_data['id'],
+            name=inst_data['name'],
+            # The same few family and clef names repeat across the whole
+            # database; interning shares one string object for each
+            family=sys.intern(inst_data['family']),
+            transposition_type=inst_data['transposition']['type'],
+            transposition_semitones=inst_data['transposition']['semitones'],
+            clefs=tuple(map(sys.intern, inst_data['clefs'])),
+            sounding_range=(
+                inst_data['sounding_range']['lowest'],
+                inst_data['sounding_range']['highest']
+            ),
+            written_range=(
+                inst_data['written_range']['lowest'],
+                inst_data['written_range']['highest']
+            ),
+            preferred_range=(
+                inst_data['preferred_range']['lowest'],
+                inst_data['preferred_range']['highest']
+            ),
+            octave_displacement=inst_data['octave_displacement'],
+            midi_program=inst_data['midi_program'],
+            lyrics_support=inst_data.get('lyrics_support', False)
+        )
     
     def get_instrument(self, instrument_id: str) -> Optional[Instrument]:
         """Get instrument by ID."""
-        return self.instruments.get(instrument_id)
+        inst = self.instruments.get(instrument_id)
+        if inst is None:
+            inst_data = self._raw.get(instrument_id)
+            if inst_data is None:
+                return None
+            inst = self._materialize(inst_data)
+            self.instruments[instrument_id] = inst
+        return inst
     
     def list_by_family(self, family: str) -> List[Instrument]:
-        """Get all instruments in a family."""
-        return [inst for inst in self.instruments.values() 
-                if inst.family == family]
+        """Get all instruments in a family, in database order."""
+        instruments = self._by_family_cache.get(family)
+        if instruments is None:
+            inst_ids = self._family_ids.get(family)
+            if inst_ids is None:
+                return []
+            instruments = [self.get_instrument(inst_id) for inst_id in inst_ids]
+            self._by_family_cache[family] = instruments
+        return list(instruments)
     
     def get_all_families(self) -> List[str]:
         """Get list of all instrument families."""
-        families = set(inst.family for inst in self.instruments.values())
-        return sorted(families)
+        if self._families_cache is None:
+            self._families_cache = sorted(self._family_ids)
+        return list(self._families_cache)
     
     def get_all_instruments(self) -> List[Instrument]:
         """Get all instruments sorted by family then name."""
-        instruments = list(self.instruments.values())
-        instruments.sort(key=lambda x: (x.family, x.name))
-        return instruments
+        if self._all_instruments_cache is None:
+            instruments = [self.get_instrument(inst_id) for inst_id in self._raw]
+            instruments.sort(key=lambda x: (x.family, x.name))
+            self._all_instruments_cache = instruments
+        return list(self._all_instruments_cache)
     
     def get_transposition_semitones(self, instrument_id: str) -> int:
         """Get transposition in semitones (concert to written)."""
@@ -112,18 +202,5 @@ class InstrumentDatabase:
         if avg_pitch_midi is None:
             return inst.clefs[0]
         
-        # Select clef based on average pitch
-        # This is a simplified heuristic
-        if 'treble' in inst.clefs and avg_pitch_midi >= 60:  # Middle C and above
-            return 'treble'
-        elif 'bass' in inst.clefs and avg_pitch_midi < 60:
-            return 'bass'
-        elif 'alto' in inst.clefs and 48 <= avg_pitch_midi < 67:
-            return 'alto'
-        elif 'tenor' in inst.clefs and 50 <= avg_pitch_midi < 64:
-            return 'tenor'
-        
-        return inst.clefs[0]
-
-
-import sys
+        bucket = bisect.bisect_right(_CLEF_PITCH_THRESHOLDS, avg_pitch_midi)
+        return _clef_for_pitch_bucket(inst.clefs, bucket)
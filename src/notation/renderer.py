@@ -1,5 +1,14 @@
 """Simple ASCII/text-based notation renderer."""
-from music21 import stream
+from music21 import key, meter, note, stream
+
+# Glyphs for common durations, keyed by quarterLength. Fractions hash equal
+# to the floats they equal, so music21's Fraction lengths match directly.
+_DURATION_GLYPHS = {
+    1.0: "  ♩  ",
+    0.5: "  ♪  ",
+    2.0: "  𝅗𝅥  ",
+    4.0: "  𝅝  "
+}
 
 
 class NotationRenderer:
@@ -38,41 +47,36 @@ class NotationRenderer:
                 
                 # Get all measures
                 for measure in part.getElementsByClass('Measure'):
-                    measure_num = measure.number if hasattr(measure, 'number') else "?"
-                    
-                    # Get time signature if present
-                    ts = measure.timeSignature
-                    ts_str = f" [{ts.numerator}/{ts.denominator}]" if ts else ""
+                    # Every Measure has a number; 0 when it was never set
+                    measure_num = measure.number
                     
-                    # Get key signature if present  
-                    ks = measure.keySignature
-                    ks_str = f" {ks.asKey().name}" if ks else ""
-                    
-                    output.append(f"\nMeasure {measure_num}{ts_str}{ks_str}:")
-                    
-                    # Get all notes and rests
+                    # Collect signatures, notes and rests in one pass over the
+                    # measure rather than one stream iterator per property
+                    ts = ks = None
                     notes_line = []
                     durations_line = []
                     
-                    for element in measure.notesAndRests:
-                        if element.isNote:
-                            # Show note name with octave
-                            notes_line.append(f"{element.nameWithOctave:>5}")
-                            # Show duration - convert to float for formatting
-                            ql = float(element.quarterLength)
-                            if ql == 1.0:
-                                durations_line.append("  ♩  ")
-                            elif ql == 0.5:
-                                durations_line.append("  ♪  ")
-                            elif ql == 2.0:
-                                durations_line.append("  𝅗𝅥  ")
-                            elif ql == 4.0:
-                                durations_line.append("  𝅝  ")
-                            else:
-                                durations_line.append(f" {ql:>3.1f}")
-                        elif element.isRest:
-                            notes_line.append(" REST")
-                            durations_line.append(f" {float(element.quarterLength):>3.1f}")
+                    for element in measure.elements:
+                        if isinstance(element, note.GeneralNote):
+                            ql = element.quarterLength
+                            if element.isNote:
+                                # Show note name with octave, and a glyph for
+                                # the duration if there is one, else the number
+                                notes_line.append(f"{element.nameWithOctave:>5}")
+                                durations_line.append(_DURATION_GLYPHS.get(ql) or f" {float(ql):>3.1f}")
+                            elif element.isRest:
+                                notes_line.append(" REST")
+                                durations_line.append(f" {float(ql):>3.1f}")
+                        elif isinstance(element, meter.TimeSignature):
+                            if ts is None and measure.elementOffset(element) == 0:
+                                ts = element
+                        elif isinstance(element, key.KeySignature):
+                            if ks is None and measure.elementOffset(element) == 0:
+                                ks = element
+                    
+                    ts_str = f" [{ts.numerator}/{ts.denominator}]" if ts else ""
+                    ks_str = f" {ks.asKey().name}" if ks else ""
+                    output.append(f"\nMeasure {measure_num}{ts_str}{ks_str}:")
                     
                     if notes_line:
                         output.append("  Notes:     " + " ".join(notes_line))
@@ -1,15 +1,126 @@
 """Build music21 Score from analyzed audio."""
 
+import functools
+import re
 import music21
 from typing import List, Tuple, Optional
 import numpy as np
 
-from audio.rhythm_quantizer import QuantizedNote
+from audio.rhythm_quantizer import QuantizedNotes
 from audio.key_detector import KeyDetector
 from notation.instrument_db import Instrument, InstrumentDatabase
 from notation.transposer import Transposer
 from utils.config import DEFAULT_TEMPO
 
+# Resolution of the grid notes are laid out on; every valid quantized
+# duration is a whole number of ticks
+_TICKS_PER_QUARTER = 480
+
+# Clef classes by name; instantiated per use since music21 mutates clefs in streams
+_CLEF_MAP = {
+    'treble': music21.clef.TrebleClef,
+    'bass': music21.clef.BassClef,
+    'alto': music21.clef.AltoClef,
+    'tenor': music21.clef.TenorClef
+}
+
+# music21 instrument classes by family, matched in order against the
+# lowercased instrument id (a simplified mapping)
+_M21_INSTRUMENT_MAP = {
+    'Strings': (
+        ('violin', music21.instrument.Violin),
+        ('viola', music21.instrument.Viola),
+        ('cello', music21.instrument.Violoncello),
+        ('bass', music21.instrument.Contrabass),
+        ('harp', music21.instrument.Harp),
+        ('guitar', music21.instrument.Guitar)
+    ),
+    'Brass': (
+        ('horn', music21.instrument.Horn),
+        ('trumpet', music21.instrument.Trumpet),
+        ('trombone', music21.instrument.Trombone),
+        ('tuba', music21.instrument.Tuba)
+    ),
+    'Woodwinds': (
+        ('flute', music21.instrument.Flute),
+        ('oboe', music21.instrument.Oboe),
+        ('clarinet', music21.instrument.Clarinet),
+        ('bassoon', music21.instrument.Bassoon),
+        ('saxophone', music21.instrument.Saxophone)
+    ),
+    'Keyboard': (
+        ('piano', music21.instrument.Piano),
+        ('organ', music21.instrument.Organ),
+        ('harpsichord', music21.instrument.Harpsichord)
+    ),
+    # Every vocal part is a Voice; the empty key matches any id
+    'Vocal': (
+        ('', music21.instrument.Vocalist),
+    )
+}
+
+
+def _compile_instrument_matcher(entries):
+    """
+    Compile a family's (substring, class) pairs into one pattern.
+    
+    Each alternative is anchored at the start and scans ahead for its
+    substring, so the regex engine tries the substrings in table order
+    and the first one found anywhere in the id wins, as with a loop of
+    `in` tests. The capturing group that matched identifies the class.
+    
+    Args:
+        entries: Ordered (substring, music21 instrument class) pairs
+        
+    Returns:
+        Tuple of (compiled pattern, classes indexed by group number - 1)
+    """
+    pattern = '|'.join(f'.*?({re.escape(key)})' for key, _ in entries)
+    classes = tuple(instrument_class for _, instrument_class in entries)
+    return re.compile(pattern, re.DOTALL), classes
+
+
+_M21_INSTRUMENT_MATCHERS = {
+    family: _compile_instrument_matcher(entries)
+    for family, entries in _M21_INSTRUMENT_MAP.items()
+}
+
+
+@functools.lru_cache(maxsize=None)
+def _music21_instrument_class(family: str, instrument_id: str):
+    """Return the music21 instrument class for an instrument, or None if there is none."""
+    matcher = _M21_INSTRUMENT_MATCHERS.get(family)
+    if matcher is None:
+        return None
+    pattern, classes = matcher
+    match = pattern.match(instrument_id.lower())
+    return classes[match.lastindex - 1] if match else None
+
+
+def notes_from_arrays(midi_notes, durations) -> List[music21.note.Note]:
+    """
+    Create music21 notes for parallel sequences of pitches and durations.
+    
+    Builds each Pitch and Duration directly instead of letting Note parse
+    keyword arguments and then reassigning quarterLength.
+    
+    Args:
+        midi_notes: MIDI note numbers (list or numpy array)
+        durations: Durations in quarter notes
+    
+    Returns:
+        List of music21 Note objects, in input order
+    """
+    if isinstance(midi_notes, np.ndarray):
+        midi_notes = midi_notes.tolist()
+    if isinstance(durations, np.ndarray):
+        durations = durations.tolist()
+    Note, Pitch, Duration = music21.note.Note, music21.pitch.Pitch, music21.duration.Duration
+    return [
+        Note(Pitch(midi=int(pitch)), duration=Duration(quarter_length))
+        for pitch, quarter_length in zip(midi_notes, durations)
+    ]
+
 
 class ScoreBuilder:
     """Builds music21 Score from quantized notes."""
@@ -19,7 +130,7 @@ class ScoreBuilder:
     
     def build(
         self,
-        notes: List[QuantizedNote],
+        notes: QuantizedNotes,
         instrument: Instrument,
         key_name: str,
         time_signature: Tuple[int, int],
@@ -30,7 +141,7 @@ class ScoreBuilder:
         Build a music21 Score from quantized notes.
         
         Args:
-            notes: List of quantized notes
+            notes: Quantized notes
             instrument: Instrument object
             key_name: Key signature (e.g., "C major", "A minor")
             time_signature: Tuple of (numerator, denominator)
@@ -65,7 +176,7 @@ class ScoreBuilder:
         measure.insert(0, tempo)
         
         # Add clef
-        avg_pitch = np.mean([n.midi_note for n in notes]) if notes else 60
+        avg_pitch = np.mean(notes.midi_note) if len(notes) else 60
         clef_name = self.instrument_db.get_preferred_clef(instrument.id, int(avg_pitch))
         clef = self._get_clef(clef_name)
         measure.insert(0, clef)
@@ -73,34 +184,43 @@ class ScoreBuilder:
         # Convert notes to written pitch if needed
         if use_written_pitch:
             note_pitches = Transposer.concert_to_written(
-                [n.midi_note for n in notes],
+                notes.midi_note,
                 instrument
             )
         else:
-            note_pitches = [n.midi_note for n in notes]
+            note_pitches = notes.midi_note.tolist()
         
-        # Add notes to measures
-        current_beat = 0.0
-        beats_per_measure = time_signature[0] * (4.0 / time_signature[1])
+        # Lay notes out on an integer tick grid: each note's start is the
+        # running sum of the durations before it, split into a measure
+        # index and an offset within that measure
+        ticks_per_measure = time_signature[0] * (4 * _TICKS_PER_QUARTER // time_signature[1])
+        duration_ticks = np.rint(notes.duration_beats * _TICKS_PER_QUARTER).astype(np.int64)
+        start_ticks = np.cumsum(duration_ticks) - duration_ticks
+        measure_indices, offset_ticks = np.divmod(start_ticks, ticks_per_measure)
+        offsets = (offset_ticks / _TICKS_PER_QUARTER).tolist()
         measure_number = 1
         
-        for note, pitch in zip(notes, note_pitches):
-            # Check if we need a new measure
-            while current_beat >= beats_per_measure:
+        # Create all notes up front
+        durations = notes.duration_beats.tolist()
+        m21_notes = notes_from_arrays(note_pitches, durations)
+        
+        # Notes go in with coreInsert, which skips music21's per-insert
+        # bookkeeping; coreElementsChanged() updates each measure once
+        # before it is added to the part
+        for measure_index, offset, m21_note in zip(measure_indices.tolist(), offsets, m21_notes):
+            # Start new measures up to this note's (empty ones included
+            # when a long note spans a barline)
+            while measure_number <= measure_index:
+                measure.coreElementsChanged()
                 part.append(measure)
                 measure_number += 1
                 measure = music21.stream.Measure(number=measure_number)
-                current_beat -= beats_per_measure
-            
-            # Create note
-            m21_note = music21.note.Note(midi=pitch)
-            m21_note.quarterLength = note.duration_beats
             
             # Add to measure
-            measure.insert(current_beat, m21_note)
-            current_beat += note.duration_beats
+            measure.coreInsert(offset, m21_note)
         
         # Append final measure
+        measure.coreElementsChanged()
         if len(measure.notesAndRests) > 0:
             part.append(measure)
         
@@ -111,50 +231,9 @@ class ScoreBuilder:
     
     def _get_music21_instrument(self, instrument: Instrument) -> music21.instrument.Instrument:
         """Get appropriate music21 instrument object."""
-        # Map instrument family to music21 instrument classes
-        # This is a simplified mapping
-        if instrument.family == 'Strings':
-            if 'violin' in instrument.id.lower():
-                return music21.instrument.Violin()
-            elif 'viola' in instrument.id.lower():
-                return music21.instrument.Viola()
-            elif 'cello' in instrument.id.lower():
-                return music21.instrument.Violoncello()
-            elif 'bass' in instrument.id.lower():
-                return music21.instrument.Contrabass()
-            elif 'harp' in instrument.id.lower():
-                return music21.instrument.Harp()
-            elif 'guitar' in instrument.id.lower():
-                return music21.instrument.Guitar()
-        elif instrument.family == 'Brass':
-            if 'horn' in instrument.id.lower():
-                return music21.instrument.Horn()
-            elif 'trumpet' in instrument.id.lower():
-                return music21.instrument.Trumpet()
-            elif 'trombone' in instrument.id.lower():
-                return music21.instrument.Trombone()
-            elif 'tuba' in instrument.id.lower():
-                return music21.instrument.Tuba()
-        elif instrument.family == 'Woodwinds':
-            if 'flute' in instrument.id.lower():
-                return music21.instrument.Flute()
-            elif 'oboe' in instrument.id.lower():
-                return music21.instrument.Oboe()
-            elif 'clarinet' in instrument.id.lower():
-                return music21.instrument.Clarinet()
-            elif 'bassoon' in instrument.id.lower():
-                return music21.instrument.Bassoon()
-            elif 'saxophone' in instrument.id.lower():
-                return music21.instrument.Saxophone()
-        elif instrument.family == 'Keyboard':
-            if 'piano' in instrument.id.lower():
-                return music21.instrument.Piano()
-            elif 'organ' in instrument.id.lower():
-                return music21.instrument.Organ()
-            elif 'harpsichord' in instrument.id.lower():
-                return music21.instrument.Harpsichord()
-        elif instrument.family == 'Vocal':
-            return music21.instrument.Voice()
+        instrument_class = _music21_instrument_class(instrument.family, instrument.id)
+        if instrument_class is not None:
+            return instrument_class()
         
         # Default: generic instrument
         generic = music21.instrument.Instrument()
@@ -165,10 +244,4 @@ class ScoreBuilder:
     @staticmethod
     def _get_clef(clef_name: str) -> music21.clef.Clef:
         """Get music21 clef object from name."""
-        clef_map = {
-            'treble': music21.clef.TrebleClef(),
-            'bass': music21.clef.BassClef(),
-            'alto': music21.clef.AltoClef(),
-            'tenor': music21.clef.TenorClef()
-        }
-        return clef_map.get(clef_name.lower(), music21.clef.TrebleClef())
+        return _CLEF_MAP.get(clef_name.lower(), music21.clef.TrebleClef)()
@@ -19,7 +19,8 @@ class Transposer:
         Convert concert pitch to written pitch for an instrument.
         
         Args:
-            concert_pitches: List of MIDI note numbers in concert pitch
+            concert_pitches: MIDI note numbers in concert pitch (list or array);
+                fractional values are rounded to the nearest semitone
             instrument: Instrument object with transposition info
         
         Returns:
@@ -30,12 +31,13 @@ class Transposer:
         # So written pitch = concert pitch - transposition_semitones
         # If transposition_semitones = -7, written = concert - (-7) = concert + 7
         
-        written_pitches = []
-        for concert_pitch in concert_pitches:
-            written_pitch = concert_pitch - instrument.transposition_semitones
-            written_pitches.append(written_pitch)
-        
-        return written_pitches
+        # Round fractional (e.g. detected) pitches to the nearest semitone;
+        # casting straight to int16 would truncate 60.7 to 60
+        pitches = np.rint(np.asarray(concert_pitches)).astype(np.int16)
+        if instrument.transposition_semitones == 0:
+            # Instruments in C: written pitch is concert pitch
+            return pitches.tolist()
+        return (pitches - np.int16(instrument.transposition_semitones)).tolist()
     
     @staticmethod
     def written_to_concert(
@@ -46,18 +48,17 @@ class Transposer:
         Convert written pitch to concert pitch for an instrument.
         
         Args:
-            written_pitches: List of MIDI note numbers in written pitch
+            written_pitches: MIDI note numbers in written pitch (list or array);
+                fractional values are rounded to the nearest semitone
             instrument: Instrument object with transposition info
         
         Returns:
             List of MIDI note numbers in concert pitch
         """
-        concert_pitches = []
-        for written_pitch in written_pitches:
-            concert_pitch = written_pitch + instrument.transposition_semitones
-            concert_pitches.append(concert_pitch)
-        
-        return concert_pitches
+        pitches = np.rint(np.asarray(written_pitches)).astype(np.int16)
+        if instrument.transposition_semitones == 0:
+            return pitches.tolist()
+        return (pitches + np.int16(instrument.transposition_semitones)).tolist()
     
     @staticmethod
     def transpose_stream(
@@ -1,5 +1,6 @@
 """Main application window."""
 
+import functools
 import sys
 from PySide6.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
@@ -7,23 +8,22 @@ from PySide6.QtWidgets import (
     QProgressBar, QTextEdit, QGroupBox, QFileDialog,
     QMessageBox, QApplication, QLineEdit
 )
-from PySide6.QtCore import QTimer, Qt
-from PySide6.QtGui import QFont
+from PySide6.QtCore import QTimer, QThread, Qt
+from PySide6.QtGui import QFont, QTextCursor
 import numpy as np
 
 from notation.instrument_db import InstrumentDatabase, Instrument
 from audio.recorder import AudioRecorder
-from audio.pitch_detector import PitchDetector
 from audio.rhythm_quantizer import RhythmQuantizer
 from audio.key_detector import KeyDetector
 from notation.score_builder import ScoreBuilder
-from notation.renderer import NotationRenderer
 from export.musicxml import MusicXMLExporter
 from export.midi import MIDIExporter
 from export.pdf import PDFExporter
 from audio.midi_player import MIDIPlayer
 from utils.config import INSTRUMENTS_DB_PATH, LEVEL_UPDATE_INTERVAL
 from utils.git_version import GIT_COMMIT
+from ui.transcription_worker import PitchDetectorLoader, TranscriptionWorker
 
 
 class MainWindow(QMainWindow):
@@ -35,7 +35,7 @@ class MainWindow(QMainWindow):
         # Initialize components
         self.instrument_db = InstrumentDatabase(INSTRUMENTS_DB_PATH)
         self.recorder = AudioRecorder()
-        self.pitch_detector = PitchDetector()  # Uses librosa pYIN
+        self.pitch_detector = None  # loaded in the background, see _start_pitch_detector_loader
         self.rhythm_quantizer = RhythmQuantizer()
         self.key_detector = KeyDetector()
         self.score_builder = ScoreBuilder(self.instrument_db)
@@ -46,6 +46,26 @@ class MainWindow(QMainWindow):
         self.current_notes = None
         self.detected_key = "C major"
         self.key_confidence = 0.0
+        # Scores built for export, by (written pitch, instrument id, time signature, tempo)
+        self._export_scores = {}
+        
+        # Background transcription (one at a time)
+        self._transcription_thread = None
+        self._transcription_worker = None
+        self._progress_cursor = None
+        
+        # Background pitch detector loading, and the (instrument, time
+        # signature, tempo) of a transcription waiting for it to finish
+        self._loader_thread = None
+        self._pitch_detector_loader = None
+        self._pending_transcription = None
+        
+        # Last level meter value and status shown, see update_levels
+        self._level_bar_value = -80
+        self._level_state = None
+        
+        # PDF exporter, created on first PDF export (looks for MuseScore)
+        self.pdf_exporter = None
         
         # MIDI Player
         self.midi_player = MIDIPlayer()
@@ -60,6 +80,10 @@ class MainWindow(QMainWindow):
         
         # Set default instrument
         self.on_family_changed(0)
+        
+        # Load the pitch detector once the event loop is running, i.e. after
+        # the window has been shown
+        QTimer.singleShot(0, self._start_pitch_detector_loader)
     
     def init_ui(self):
         """Initialize user interface."""
@@ -249,9 +273,7 @@ class MainWindow(QMainWindow):
         filtered = [inst for inst in all_instruments if search_text in inst.name.lower()]
         
         # Update combo box
-        self.instrument_combo.clear()
-        for inst in sorted(filtered, key=lambda x: x.name):
-            self.instrument_combo.addItem(inst.name, inst.id)
+        self._set_instrument_items(sorted(filtered, key=lambda x: x.name))
         
         # Auto-select first result if only one match
         if len(filtered) == 1:
@@ -268,9 +290,23 @@ class MainWindow(QMainWindow):
         family = self.family_combo.currentText()
         instruments = self.instrument_db.list_by_family(family)
         
-        self.instrument_combo.clear()
-        for inst in instruments:
-            self.instrument_combo.addItem(inst.name, inst.id)
+        self._set_instrument_items(instruments)
+    
+    def _set_instrument_items(self, instruments):
+        """Replace the instrument combo's items, selecting the first one."""
+        combo = self.instrument_combo
+        
+        # Fill the combo in one batch with its signals blocked, then report a
+        # single selection change instead of one per added item
+        combo.blockSignals(True)
+        combo.clear()
+        combo.addItems([inst.name for inst in instruments])
+        for i, inst in enumerate(instruments):
+            combo.setItemData(i, inst.id)
+        combo.blockSignals(False)
+        
+        if instruments:
+            combo.currentIndexChanged.emit(0)
     
     def on_instrument_changed(self, index):
         """Handle instrument selection change."""
@@ -292,6 +328,7 @@ class MainWindow(QMainWindow):
         self.transcribe_btn.setEnabled(False)
         self.level_status.setText("Recording...")
         self.level_status.setStyleSheet("color: red; font-weight: bold;")
+        self._level_state = None  # status label no longer shows a level state
     
     def on_stop_clicked(self):
         """Stop recording."""
@@ -301,6 +338,7 @@ class MainWindow(QMainWindow):
         self.transcribe_btn.setEnabled(True)
         self.level_status.setText("Stopped")
         self.level_status.setStyleSheet("color: green; font-weight: bold;")
+        self._level_state = None
         
         if len(self.recorded_audio) > 0:
             duration = len(self.recorded_audio) / 44100.0
@@ -320,74 +358,189 @@ class MainWindow(QMainWindow):
             QMessageBox.warning(self, "No Instrument", "Please select an instrument.")
             return
         
-        # Show progress
+        if self._transcription_thread is not None or self._pending_transcription is not None:
+            return  # already transcribing
+        
+        self._export_scores.clear()
+        
+        # Show progress; stage messages are inserted as plain text at a
+        # cursor kept at the end rather than appended as new paragraphs
         self.notation_text.setText("Analyzing audio...\n")
-        QApplication.processEvents()
+        self._progress_cursor = QTextCursor(self.notation_text.document())
+        self._progress_cursor.movePosition(QTextCursor.End)
+        self._set_transcription_controls_enabled(False)
+        
+        settings = (
+            self.current_instrument,
+            self._parse_time_signature(self.time_sig_combo.currentText()),
+            self.tempo_spin.value()
+        )
         
-        try:
-            # Detect pitch
-            self.notation_text.append("- Detecting pitch...\n")
-            QApplication.processEvents()
-            pitch_analysis = self.pitch_detector.detect(self.recorded_audio)
-            
-            # Detect key
-            self.notation_text.append("- Detecting key...\n")
-            QApplication.processEvents()
-            self.detected_key, self.key_confidence = self.key_detector.detect(pitch_analysis.midi_notes)
-            self.key_label.setText(f"{self.detected_key} (confidence: {self.key_confidence:.2f})")
-            
-            # Quantize rhythm
-            self.notation_text.append("- Quantizing rhythm...\n")
-            QApplication.processEvents()
-            time_sig = self._parse_time_signature(self.time_sig_combo.currentText())
-            self.rhythm_quantizer.set_time_signature(*time_sig)
-            
-            quantized_notes = self.rhythm_quantizer.quantize(
-                self.recorded_audio,
-                pitch_analysis.times,
-                pitch_analysis.midi_notes,
-                pitch_analysis.confidences
-            )
-            self.current_notes = quantized_notes
-            
-            # Build score (written pitch)
-            self.notation_text.append("- Building score...\n")
-            QApplication.processEvents()
-            self.current_score = self.score_builder.build(
-                quantized_notes,
-                self.current_instrument,
-                self.detected_key,
-                time_sig,
-                self.tempo_spin.value(),
-                use_written_pitch=True
-            )
-            
-            # Display results
-            self.notation_text.clear()
-            self.notation_text.append(f"✓ Transcription complete!\n")
-            self.notation_text.append(f"- Detected notes: {len(quantized_notes)}")
-            self.notation_text.append(f"- Key: {self.detected_key}")
-            self.notation_text.append(f"- Instrument: {self.current_instrument.name}")
-            
-            if self.current_instrument.transposition_semitones != 0:
-                self.notation_text.append(f"- Transposition: {self.current_instrument.transposition_semitones} semitones")
-            
-            self.notation_text.append("\n" + "=" * 60 + "\n")
-            
-            # Render notation visually
-            notation_display = NotationRenderer.render_to_text(self.current_score)
-            self.notation_text.append(notation_display)
-            
-            # Enable export and playback buttons
-            self.export_mxml_concert_btn.setEnabled(True)
-            self.export_mxml_written_btn.setEnabled(True)
-            self.export_midi_btn.setEnabled(True)
-            self.export_pdf_btn.setEnabled(True)
-            self.playback_btn.setEnabled(True)
-            
-        except Exception as e:
-            QMessageBox.critical(self, "Transcription Error", f"Error during transcription:\n{str(e)}")
-            self.notation_text.append(f"\n✗ Error: {str(e)}\n")
+        if self.pitch_detector is None:
+            # Still loading (or loading failed); start once it is ready
+            self._pending_transcription = settings
+            self.on_transcription_progress("- Loading pitch detector...")
+            if self._loader_thread is None:
+                self._start_pitch_detector_loader()
+            return
+        
+        self._start_transcription(*settings)
+    
+    def _start_transcription(self, instrument: Instrument, time_sig: tuple, tempo_bpm: int):
+        """Run the analysis of the recording on a worker thread."""
+        self.rhythm_quantizer.set_time_signature(*time_sig)
+        
+        # Run the analysis on a worker thread so the window stays responsive
+        thread = QThread(self)
+        worker = TranscriptionWorker(
+            self.recorded_audio,
+            self.pitch_detector,
+            self.key_detector,
+            self.rhythm_quantizer,
+            self.score_builder,
+            instrument,
+            time_sig,
+            tempo_bpm
+        )
+        worker.moveToThread(thread)
+        thread.started.connect(worker.run)
+        worker.progress.connect(self.on_transcription_progress)
+        worker.finished.connect(self.on_transcription_finished)
+        worker.error.connect(self.on_transcription_error)
+        worker.finished.connect(thread.quit)
+        worker.error.connect(thread.quit)
+        thread.finished.connect(worker.deleteLater)
+        thread.finished.connect(thread.deleteLater)
+        thread.finished.connect(self._on_transcription_thread_finished)
+        
+        self._transcription_thread = thread
+        self._transcription_worker = worker
+        thread.start()
+    
+    def _start_pitch_detector_loader(self):
+        """
+        Import, create and warm up the pitch detector on a background thread.
+        
+        Deferred from startup because importing it loads librosa and
+        compiles numba kernels, which would delay the window appearing.
+        """
+        thread = QThread(self)
+        loader = PitchDetectorLoader()
+        loader.moveToThread(thread)
+        thread.started.connect(loader.run)
+        loader.finished.connect(self._on_pitch_detector_loaded)
+        loader.error.connect(self._on_pitch_detector_error)
+        loader.finished.connect(thread.quit)
+        loader.error.connect(thread.quit)
+        thread.finished.connect(loader.deleteLater)
+        thread.finished.connect(thread.deleteLater)
+        thread.finished.connect(self._on_loader_thread_finished)
+        
+        self._loader_thread = thread
+        self._pitch_detector_loader = loader
+        thread.start()
+    
+    def _on_pitch_detector_loaded(self, pitch_detector):
+        """Keep the loaded detector and start a transcription waiting for it."""
+        self.pitch_detector = pitch_detector
+        
+        if self._pending_transcription is not None:
+            settings = self._pending_transcription
+            self._pending_transcription = None
+            self._start_transcription(*settings)
+    
+    def _on_pitch_detector_error(self, message):
+        """Report a failed load; the next transcription tries again."""
+        print(f"Pitch detector error: {message}")
+        
+        if self._pending_transcription is not None:
+            self._pending_transcription = None
+            self.on_transcription_error(message)
+            self._set_transcription_controls_enabled(True)
+    
+    def _on_loader_thread_finished(self):
+        """Forget the loader once its thread has stopped."""
+        self._loader_thread = None
+        self._pitch_detector_loader = None
+        
+        # A click between a failed load and this point found the loader
+        # still running and queued its transcription; load again for it
+        if self._pending_transcription is not None and self.pitch_detector is None:
+            self._start_pitch_detector_loader()
+    
+    def on_transcription_progress(self, message):
+        """Add a transcription stage message below the progress so far."""
+        self._progress_cursor.insertText(f"\n{message}\n")
+    
+    def on_transcription_finished(self, result):
+        """Show a finished transcription and enable export and playback."""
+        self.detected_key = result.key_name
+        self.key_confidence = result.key_confidence
+        self.key_label.setText(f"{self.detected_key} (confidence: {self.key_confidence:.2f})")
+        self.current_notes = result.notes
+        self.current_score = result.score
+        self._export_scores = {
+            (True, result.instrument.id, result.time_signature, result.tempo_bpm): result.score
+        }
+        
+        # Display results, replacing the progress text in one update
+        lines = [
+            f"✓ Transcription complete!\n",
+            f"- Detected notes: {len(result.notes)}",
+            f"- Key: {self.detected_key}",
+            f"- Instrument: {result.instrument.name}"
+        ]
+        
+        if result.instrument.transposition_semitones != 0:
+            lines.append(f"- Transposition: {result.instrument.transposition_semitones} semitones")
+        
+        lines.append("\n" + "=" * 60 + "\n")
+        lines.append(result.notation_text)
+        self.notation_text.setPlainText("\n".join(lines))
+        
+        # Enable export and playback buttons
+        self.export_mxml_concert_btn.setEnabled(True)
+        self.export_mxml_written_btn.setEnabled(True)
+        self.export_midi_btn.setEnabled(True)
+        self.export_pdf_btn.setEnabled(True)
+        self.playback_btn.setEnabled(True)
+    
+    def on_transcription_error(self, message):
+        """Report a failed transcription."""
+        QMessageBox.critical(self, "Transcription Error", f"Error during transcription:\n{message}")
+        self.notation_text.append(f"\n✗ Error: {message}\n")
+    
+    def _on_transcription_thread_finished(self):
+        """Allow a new transcription once the worker thread has stopped."""
+        self._transcription_thread = None
+        self._transcription_worker = None
+        self._set_transcription_controls_enabled(True)
+    
+    def _set_transcription_controls_enabled(self, enabled: bool):
+        """
+        Enable or disable the controls a running transcription depends on.
+        
+        The worker keeps the instrument it was started with and shares the
+        rhythm quantizer, which the tempo and time signature controls
+        update directly. They are locked with the instrument selectors so
+        notes are quantized, labelled and cached with the settings the
+        transcription started with.
+        """
+        self.transcribe_btn.setEnabled(enabled)
+        self.record_btn.setEnabled(enabled)
+        self.search_input.setEnabled(enabled)
+        self.family_combo.setEnabled(enabled)
+        self.instrument_combo.setEnabled(enabled)
+        self.tempo_spin.setEnabled(enabled)
+        self.time_sig_combo.setEnabled(enabled)
+    
+    def closeEvent(self, event):
+        """Let a running transcription or detector load finish before the window goes away."""
+        for thread in (self._transcription_thread, self._loader_thread):
+            if thread is not None:
+                thread.quit()
+                thread.wait()
+        super().closeEvent(event)
     
     def on_export_musicxml(self, written_pitch: bool):
         """Export to MusicXML."""
@@ -403,16 +556,7 @@ class MainWindow(QMainWindow):
         )
         
         if filename:
-            # Rebuild score with correct pitch type
-            time_sig = self._parse_time_signature(self.time_sig_combo.currentText())
-            score = self.score_builder.build(
-                self.current_notes,
-                self.current_instrument,
-                self.detected_key,
-                time_sig,
-                self.tempo_spin.value(),
-                use_written_pitch=written_pitch
-            )
+            score = self._export_score(written_pitch)
             
             try:
                 # Add title and composer
@@ -427,6 +571,23 @@ class MainWindow(QMainWindow):
             except Exception as e:
                 QMessageBox.critical(self, "Export Error", f"Failed to export MusicXML:\n{str(e)}")
     
+    def _export_score(self, written_pitch: bool):
+        """Score for the current settings in the given pitch, built at most once."""
+        time_sig = self._parse_time_signature(self.time_sig_combo.currentText())
+        key = (written_pitch, self.current_instrument.id, time_sig, self.tempo_spin.value())
+        score = self._export_scores.get(key)
+        if score is None:
+            score = self.score_builder.build(
+                self.current_notes,
+                self.current_instrument,
+                self.detected_key,
+                time_sig,
+                self.tempo_spin.value(),
+                use_written_pitch=written_pitch
+            )
+            self._export_scores[key] = score
+        return score
+    
     def on_export_midi(self):
         """Export to MIDI."""
         if not self.current_score:
@@ -455,13 +616,30 @@ class MainWindow(QMainWindow):
             return
         
         rms, peak = self.recorder.get_levels()
-        self.level_bar.setValue(int(peak))
         
-        # Update status
+        # Clamp to the bar's range (Qt ignores out-of-range values, which
+        # left the bar stuck when the input went silent) and only touch the
+        # widget when the displayed value changes
+        bar_value = max(-80, min(0, int(peak)))
+        if bar_value != self._level_bar_value:
+            self.level_bar.setValue(bar_value)
+            self._level_bar_value = bar_value
+        
+        # Update status; restyling re-polishes the label, so only on a change
         if self.recorder.is_clipping():
+            state = 'clipping'
+        elif self.recorder.is_too_quiet():
+            state = 'quiet'
+        else:
+            state = 'ok'
+        if state == self._level_state:
+            return
+        self._level_state = state
+        
+        if state == 'clipping':
             self.level_status.setText("⚠ CLIPPING!")
             self.level_status.setStyleSheet("color: red; font-weight: bold;")
-        elif self.recorder.is_too_quiet():
+        elif state == 'quiet':
             self.level_status.setText("⚠ Too quiet")
             self.level_status.setStyleSheet("color: orange; font-weight: bold;")
         else:
@@ -492,7 +670,9 @@ class MainWindow(QMainWindow):
                 self.current_score.metadata.title = title
                 self.current_score.metadata.composer = composer
                 
-                success = PDFExporter().export(self.current_score, filename)
+                if self.pdf_exporter is None:
+                    self.pdf_exporter = PDFExporter()
+                success = self.pdf_exporter.export(self.current_score, filename)
                 if success:
                     QMessageBox.information(self, "Export Success", f"Exported to:\n{filename}")
                 else:
@@ -533,6 +713,7 @@ class MainWindow(QMainWindow):
             QMessageBox.critical(self, "Playback Error", f"Failed to play back:\n{str(e)}")
     
     @staticmethod
+    @functools.lru_cache(maxsize=8)
     def _parse_time_signature(ts_str: str) -> tuple:
         """Parse time signature string like '4/4' to (4, 4)."""
         parts = ts_str.split('/')
@@ -0,0 +1,150 @@
+"""Background pitch detector loading and transcription for the main window."""
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Tuple
+
+import numpy as np
+from PySide6.QtCore import QObject, Signal, Slot
+import music21
+
+from audio.rhythm_quantizer import RhythmQuantizer, QuantizedNotes
+from audio.key_detector import KeyDetector
+from notation.instrument_db import Instrument
+from notation.score_builder import ScoreBuilder
+from notation.renderer import NotationRenderer
+
+if TYPE_CHECKING:
+    # Imported by PitchDetectorLoader; importing it loads librosa and numba
+    from audio.pitch_detector import PitchDetector
+
+
+@dataclass
+class TranscriptionResult:
+    """Everything the window needs from a finished transcription."""
+    key_name: str
+    key_confidence: float
+    notes: QuantizedNotes
+    score: music21.stream.Score
+    notation_text: str
+    # Build settings, so the score can be reused for matching exports
+    instrument: Instrument
+    time_signature: Tuple[int, int]
+    tempo_bpm: int
+
+
+class PitchDetectorLoader(QObject):
+    """
+    Imports, creates and warms up the pitch detector.
+    
+    Importing the detector loads librosa and numba, and warming it up
+    compiles pYIN's kernels and starts its worker processes. That takes
+    seconds, so the window runs this on a QThread after it is shown.
+    """
+    
+    finished = Signal(object)  # PitchDetector
+    error = Signal(str)
+    
+    @Slot()
+    def run(self):
+        """Create the detector, emitting finished with it or error with a message."""
+        try:
+            from audio.pitch_detector import PitchDetector
+            
+            self.finished.emit(PitchDetector())  # Uses librosa pYIN
+            
+        except Exception as e:
+            self.error.emit(str(e))
+
+
+class TranscriptionWorker(QObject):
+    """
+    Runs pitch detection, key detection, quantization and score building.
+    
+    Meant to be moved to a QThread so the analysis does not block the
+    GUI event loop; results and progress come back through signals,
+    which Qt delivers on the receiver's (GUI) thread.
+    """
+    
+    progress = Signal(str)
+    finished = Signal(object)  # TranscriptionResult
+    error = Signal(str)
+    
+    def __init__(
+        self,
+        audio: np.ndarray,
+        pitch_detector: 'PitchDetector',
+        key_detector: KeyDetector,
+        rhythm_quantizer: RhythmQuantizer,
+        score_builder: ScoreBuilder,
+        instrument: Instrument,
+        time_signature: Tuple[int, int],
+        tempo_bpm: int
+    ):
+        """
+        Set up a transcription of one recording.
+        
+        Args:
+            audio: Recorded audio
+            pitch_detector: Detector to run on the audio
+            key_detector: Key detector for the detected pitches
+            rhythm_quantizer: Quantizer, already set to the time signature and tempo
+            score_builder: Builder for the written-pitch score
+            instrument: Instrument to notate for
+            time_signature: (numerator, denominator)
+            tempo_bpm: Tempo in beats per minute
+        """
+        super().__init__()
+        self.audio = audio
+        self.pitch_detector = pitch_detector
+        self.key_detector = key_detector
+        self.rhythm_quantizer = rhythm_quantizer
+        self.score_builder = score_builder
+        self.instrument = instrument
+        self.time_signature = time_signature
+        self.tempo_bpm = tempo_bpm
+    
+    @Slot()
+    def run(self):
+        """Run the pipeline, emitting finished with the result or error with a message."""
+        try:
+            # Detect pitch
+            self.progress.emit("- Detecting pitch...")
+            # Search only the pitches this instrument can play
+            pitch_analysis = self.pitch_detector.detect(
+                self.audio, note_range=self.instrument.sounding_range
+            )
+            
+            # Detect key
+            self.progress.emit("- Detecting key...")
+            key_name, key_confidence = self.key_detector.detect(pitch_analysis.midi_notes)
+            
+            # Quantize rhythm
+            self.progress.emit("- Quantizing rhythm...")
+            quantized_notes = self.rhythm_quantizer.quantize(
+                self.audio,
+                pitch_analysis.times,
+                pitch_analysis.midi_notes,
+                pitch_analysis.confidences
+            )
+            
+            # Build score (written pitch)
+            self.progress.emit("- Building score...")
+            score = self.score_builder.build(
+                quantized_notes,
+                self.instrument,
+                key_name,
+                self.time_signature,
+                self.tempo_bpm,
+                use_written_pitch=True
+            )
+            
+            # Render notation visually
+            notation_text = NotationRenderer.render_to_text(score)
+            
+            self.finished.emit(TranscriptionResult(
+                key_name, key_confidence, quantized_notes, score, notation_text,
+                self.instrument, self.time_signature, self.tempo_bpm
+            ))
+            
+        except Exception as e:
+            self.error.emit(str(e))
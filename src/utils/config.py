@@ -1,5 +1,7 @@
 """Configuration constants for MelodyTranscriber."""
 
+import os
+
 # Audio settings
 SAMPLE_RATE = 44100
 CHANNELS = 1
@@ -9,6 +11,7 @@ DTYPE = 'float32'
 DEFAULT_TEMPO = 120
 DEFAULT_TIME_SIGNATURE = (4, 4)
 LEVEL_UPDATE_INTERVAL = 50  # ms
+RECORD_BUFFER_SECONDS = 30  # initial capacity, doubled as needed
 
 # Level meter thresholds (dBFS)
 CLIPPING_THRESHOLD = -0.5
@@ -17,6 +20,14 @@ TOO_QUIET_THRESHOLD = -40.0
 # Pitch detection
 PITCH_CONFIDENCE_THRESHOLD = 0.5
 PITCH_SMOOTH_WINDOW = 5  # frames for median filtering
+PITCH_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'melody_transcriber', 'pitch')
+PITCH_CACHE_MAX_FILES = 100  # most recently used pYIN results kept in the cache
+PITCH_PARALLEL_MIN_SECONDS = 10.0  # split longer takes across processes
+PITCH_CHUNK_SECONDS = 5.0  # audio per parallel pYIN chunk
+PITCH_MAX_WORKERS = 4  # cap on pYIN worker processes (each loads librosa)
+PITCH_CHUNK_OVERLAP = 0.1  # seconds of context on each side of a chunk
+PITCH_RESOLUTION = 0.2  # pYIN pitch grid in semitones (librosa's default 0.1 is ~3.5x slower)
+PITCH_RANGE_MARGIN = 1.1  # frequency ratio allowed beyond an instrument's range (~1.7 semitones)
 
 # Rhythm quantization
 ONSET_SILENCE_THRESHOLD = -50.0  # dBFS
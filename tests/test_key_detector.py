@@ -0,0 +1,68 @@
+"""Key detector agreement with music21's key analysis."""
+
+import sys
+import os
+
+# Add parent directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import music21
+import numpy as np
+
+from audio.key_detector import KeyDetector
+
+
+# Fixed MIDI note inputs, including exact ties between keys
+CASES = {
+    'C major triad': [60, 64, 67],
+    'A minor triad': [57, 60, 64],
+    'C major scale': [60, 62, 64, 65, 67, 69, 71, 72],
+    'single note': [60],
+    'repeated notes': [62, 62, 62, 66, 69, 69, 74],
+    # Symmetric inputs: several keys correlate equally
+    'tritone': [60, 66],
+    'tritone (E-/A)': [51, 57],
+    'diminished seventh': [60, 63, 66, 69],
+    'whole tone scale': [60, 62, 64, 66, 68, 70],
+    # Flat histogram: every key correlates 0
+    'chromatic scale': list(range(60, 72)),
+}
+
+
+def music21_key(midi_notes):
+    """Key and correlation from music21's analyze('key') on equal-length notes."""
+    stream = music21.stream.Stream()
+    for midi_note in midi_notes:
+        n = music21.note.Note(midi=midi_note)
+        n.quarterLength = 1.0
+        stream.append(n)
+    key = stream.analyze('key')
+    return (f"{key.tonic.name} {key.mode}", float(key.correlationCoefficient))
+
+
+def test_key_detector_matches_music21():
+    """Test that detected keys and confidences match music21, ties included."""
+    detector = KeyDetector()
+    
+    for name, midi_notes in CASES.items():
+        expected = music21_key(midi_notes)
+        detected = detector.detect(np.array(midi_notes, dtype=float))
+        assert detected == expected, f"{name}: {detected} != {expected}"
+        print(f"✅ {name}: {detected[0]} ({detected[1]:.3f})")
+
+
+def test_key_detector_ties():
+    """Test that ties go to the higher tonic, and to minor on the same tonic."""
+    detector = KeyDetector()
+    
+    # C and F# fit B major and F major equally; B (pitch class 11) wins
+    assert detector.detect(np.array([60.0, 66.0]))[0] == 'B major'
+    
+    # No variation: all 24 keys tie at 0
+    assert detector.detect(np.arange(60.0, 72.0)) == ('B minor', 0.0)
+
+
+if __name__ == '__main__':
+    test_key_detector_matches_music21()
+    test_key_detector_ties()
+    print("\n✅ All tests passed!")
@@ -0,0 +1,104 @@
+"""Pitch detector smoothing and parallel pYIN against their reference implementations."""
+
+import sys
+import os
+
+# Add parent directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import numpy as np
+import pytest
+from scipy import ndimage
+
+from audio import pitch_detector
+from audio.pitch_detector import PitchDetector, HOP_LENGTH
+
+
+def test_smooth_to_midi_matches_median_filter():
+    """Test that the numba smoother matches median_filter(mode='nearest') exactly."""
+    if not pitch_detector.NUMBA_AVAILABLE:
+        pytest.skip("numba not available")
+    
+    rng = np.random.default_rng(0)
+    for window in (1, 3, 5, 7, 9, 15):
+        for length in (window + 1, 50, 333):
+            # Rounded values so windows contain ties
+            frequencies = np.round(rng.uniform(80.0, 900.0, length), -1)
+            expected = ndimage.median_filter(frequencies, size=window, mode='nearest')
+    
+            smoothed = frequencies.copy()
+            midi_notes = np.empty(length)
+            pitch_detector._smooth_to_midi(smoothed, window, midi_notes)
+    
+            assert np.array_equal(smoothed, expected), f"window {window}, length {length}"
+            assert np.allclose(midi_notes, PitchDetector._hz_to_midi(expected))
+    print("✅ Median smoothing matches scipy")
+
+
+def test_detect_with_nan_frames_matches_scipy_path(monkeypatch):
+    """Test that detect() handles NaN frequencies the same with and without numba."""
+    if not pitch_detector.NUMBA_AVAILABLE:
+        pytest.skip("numba not available")
+    
+    rng = np.random.default_rng(1)
+    n_frames = 200
+    f0 = rng.uniform(100.0, 600.0, n_frames)
+    f0[[0, 1, 40, 41, 42, 120, 199]] = np.nan  # edges and runs of NaN
+    voiced_flag = rng.random(n_frames) > 0.2
+    voiced_probs = rng.uniform(0.3, 1.0, n_frames)
+    
+    detector = PitchDetector(cache_dir=None, warm_up=False)
+    monkeypatch.setattr(
+        detector, '_pyin',
+        lambda audio, sr, fmin, fmax: (f0.copy(), voiced_flag.copy(), voiced_probs.copy())
+    )
+    audio = np.zeros(n_frames * HOP_LENGTH, dtype=np.float32)
+    
+    with_numba = detector.detect(audio)
+    monkeypatch.setattr(pitch_detector, 'NUMBA_AVAILABLE', False)
+    with_scipy = detector.detect(audio)
+    
+    assert not np.isnan(with_numba.data).any()
+    assert np.array_equal(with_numba.times, with_scipy.times)
+    assert np.array_equal(with_numba.frequencies, with_scipy.frequencies)
+    assert np.array_equal(with_numba.confidences, with_scipy.confidences)
+    assert np.allclose(with_numba.midi_notes, with_scipy.midi_notes)
+    print(f"✅ {len(with_numba.times)} frames match with and without numba")
+
+
+def test_pyin_parallel_matches_single_run():
+    """Test that stitched pYIN chunks match one pYIN run over a take longer than a chunk."""
+    sr = 22050
+    rng = np.random.default_rng(0)
+    notes = rng.integers(55, 80, 24)
+    t = np.arange(sr // 2) / sr
+    audio = np.concatenate([
+        0.4 * np.sin(2 * np.pi * 440.0 * 2 ** ((note - 69) / 12) * t) for note in notes
+    ]).astype(np.float32)
+    
+    detector = PitchDetector(cache_dir=None, warm_up=False)
+    f0, voiced_flag, voiced_probs = detector._pyin_parallel(
+        audio, sr, detector.fmin, detector.fmax
+    )
+    ref_f0, ref_voiced, ref_probs = pitch_detector._run_pyin(
+        audio, sr, detector.fmin, detector.fmax
+    )
+    
+    assert len(f0) == len(ref_f0)
+    
+    # Per-frame probabilities, and pitches where both runs are voiced, agree exactly
+    assert np.array_equal(voiced_probs, ref_probs)
+    both = voiced_flag & ref_voiced
+    assert np.array_equal(f0[both], ref_f0[both])
+    
+    # Voicing is decoded per chunk, so it may only differ next to a chunk boundary
+    chunk_frames = int(pitch_detector.PITCH_CHUNK_SECONDS * sr) // HOP_LENGTH
+    overlap_frames = int(np.ceil(pitch_detector.PITCH_CHUNK_OVERLAP * sr / HOP_LENGTH))
+    boundaries = np.arange(chunk_frames, len(f0), chunk_frames)
+    for frame in np.flatnonzero(voiced_flag != ref_voiced):
+        assert np.min(np.abs(boundaries - frame)) <= overlap_frames, f"frame {frame}"
+    print(f"✅ {len(f0)} frames match a single pYIN run")
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,104 @@
+"""Rhythm quantizer array grouping against the original per-note loop."""
+
+import sys
+import os
+
+# Add parent directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import numpy as np
+
+from audio.rhythm_quantizer import RhythmQuantizer
+from utils.config import MIN_NOTE_DURATION, QUANTIZATION_STRENGTH
+
+
+def reference_quantize(onset_times, pitch_times, pitch_midi, pitch_confidences, tempo_bpm):
+    """The original one-note-at-a-time grouping and quantization, as dicts."""
+    notes = []
+    onset_times = np.append(onset_times, pitch_times[-1] if len(pitch_times) > 0 else 0)
+    for i in range(len(onset_times) - 1):
+        start_time = onset_times[i]
+        end_time = onset_times[i + 1]
+        mask = (pitch_times >= start_time) & (pitch_times < end_time)
+        note_pitches = pitch_midi[mask]
+        note_confidences = pitch_confidences[mask]
+        if len(note_pitches) == 0:
+            continue
+        if np.sum(note_confidences) > 0:
+            weighted_pitch = np.average(note_pitches, weights=note_confidences)
+        else:
+            weighted_pitch = np.mean(note_pitches)
+        duration = end_time - start_time
+        if duration < MIN_NOTE_DURATION:
+            continue
+        notes.append({
+            'start_time': start_time,
+            'duration': duration,
+            'midi_note': int(round(weighted_pitch)),
+            'confidence': float(np.mean(note_confidences)),
+        })
+    
+    beat_duration = 60.0 / tempo_bpm
+    grid = 1.0 / 4
+    
+    def quantize_value(value):
+        quantized = round(value / grid) * grid
+        return value * (1 - QUANTIZATION_STRENGTH) + quantized * QUANTIZATION_STRENGTH
+    
+    valid_durations = [4.0, 3.0, 2.0, 1.5, 1.0, 0.75, 0.5, 0.375, 0.25]
+    for note in notes:
+        start_beat = quantize_value(note['start_time'] / beat_duration)
+        duration_beats = quantize_value(note['duration'] / beat_duration)
+        duration_beats = max(duration_beats, MIN_NOTE_DURATION / beat_duration)
+        if duration_beats <= 0:
+            duration_beats = 0.25
+        else:
+            duration_beats = min(valid_durations, key=lambda x: abs(x - duration_beats))
+        note['start_beat'] = start_beat
+        note['duration_beats'] = duration_beats
+        note['start_time'] = start_beat * beat_duration
+        note['duration'] = duration_beats * beat_duration
+    return notes
+
+
+def test_quantized_notes_match_per_note_loop():
+    """Test that array grouping and quantization match the original loop."""
+    rng = np.random.default_rng(0)
+    pitch_times = np.arange(0.0, 6.0, 0.0116)
+    pitch_midi = 60 + 12 * rng.random(len(pitch_times))
+    pitch_confidences = rng.uniform(0.5, 1.0, len(pitch_times))
+    pitch_confidences[100:140] = 0.0  # a note with no confidence: plain mean
+    
+    # Includes an onset gap with no frames, a note shorter than the minimum
+    # duration and onsets after the last frame
+    onset_times = np.array([0.0, 0.5, 1.02, 1.07, 1.5, 2.25, 3.0, 3.2, 3.21, 4.4, 5.9, 6.5, 7.0])
+    pitch_mask = (pitch_times < 3.0) | (pitch_times >= 3.21)
+    pitch_times = pitch_times[pitch_mask]
+    pitch_midi = pitch_midi[pitch_mask]
+    pitch_confidences = pitch_confidences[pitch_mask]
+    
+    for tempo in (60, 97, 144):
+        quantizer = RhythmQuantizer()
+        quantizer.set_tempo(tempo)
+        notes = quantizer._quantize_timings(quantizer._group_pitches_into_notes(
+            onset_times, pitch_times, pitch_midi, pitch_confidences
+        ))
+        expected = reference_quantize(
+            onset_times, pitch_times, pitch_midi, pitch_confidences, tempo
+        )
+    
+        assert len(notes) == len(expected), f"tempo {tempo}"
+        for field in ('start_time', 'duration', 'confidence', 'start_beat', 'duration_beats'):
+            assert np.allclose(getattr(notes, field), [n[field] for n in expected]), field
+        assert notes.midi_note.tolist() == [n['midi_note'] for n in expected]
+        print(f"✅ {tempo} BPM: {len(notes)} notes match")
+    
+    # as_list() gives the same values as QuantizedNote objects
+    as_list = notes.as_list()
+    assert [n.midi_note for n in as_list] == [n['midi_note'] for n in expected]
+    assert np.allclose([n.start_beat for n in as_list], [n['start_beat'] for n in expected])
+
+
+if __name__ == '__main__':
+    test_quantized_notes_match_per_note_loop()
+    print("\n✅ All tests passed!")
@@ -1,10 +1,20 @@
 """Script to update and sort the instruments database."""
 import json
 import sys
+from operator import itemgetter
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 # Read current database
-with open('src/data/instruments.json', 'r') as f:
-    data = json.load(f)
+if ORJSON_AVAILABLE:
+    with open('src/data/instruments.json', 'rb') as f:
+        data = orjson.loads(f.read())
+else:
+    with open('src/data/instruments.json', 'r') as f:
+        data = json.load(f)
 
 # Add missing Horn in B-flat
 horn_bb = {
@@ -40,27 +50,17 @@ if not exists:
 else:
     print("ℹ️  Horn in B♭ already exists")
 
-# Sort instruments alphabetically within each family
-from collections import defaultdict
-
-by_family = defaultdict(list)
-for inst in data['instruments']:
-    by_family[inst['family']].append(inst)
-
-# Sort each family
-for family in by_family:
-    by_family[family].sort(key=lambda x: x['name'])
+# Sort instruments alphabetically within each family, families in order
+data['instruments'].sort(key=itemgetter('family', 'name'))
+families = sorted({inst['family'] for inst in data['instruments']})
 
-# Rebuild instrument list with sorted families
-sorted_instruments = []
-for family in sorted(by_family.keys()):
-    sorted_instruments.extend(by_family[family])
-
-data['instruments'] = sorted_instruments
-
-# Write back
-with open('src/data/instruments.json', 'w') as f:
-    json.dump(data, f, indent=4, ensure_ascii=False)
+# Write back in the same 2-space layout generate_instruments.py produces
+if ORJSON_AVAILABLE:
+    with open('src/data/instruments.json', 'wb') as f:
+        f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+else:
+    with open('src/data/instruments.json', 'w') as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
 
-print(f"✅ Sorted {len(data['instruments'])} instruments across {len(by_family)} families")
-print("Families:", ", ".join(sorted(by_family.keys())))
+print(f"✅ Sorted {len(data['instruments'])} instruments across {len(families)} families")
+print("Families:", ", ".join(families))